@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Rodríguez Polín, Isabel
+(isabel.rodriguezp@udc.es)
+Santrich Escalona, Elizabet
+(elizabet.santrich.escalona@udc.es)
+
+Scheduling policies for the execution queues of the QueueManager.
+
+Every policy is a queue with the same interface as ArrayQueue (enqueue, dequeue, first, is_empty and len), so the QueueManager does not need to know which
+one it is using: the policy only decides which process leaves the queue next.
+
+    fifo  : ArrayQueue, the processes leave in order of arrival
+    sjf   : ShortestJobFirstQueue, the process with the shortest execution time leaves first
+    fair  : FairShareQueue, the oldest process of the user that has used the queue the least leaves first
+    aging : PriorityAgingQueue, shortest execution time first, but the priority of a process grows while it waits
+"""
+
+from array_queue import ArrayQueue, Empty
+from heapq import heappop, heappush
+
+class ShortestJobFirstQueue:
+  """Queue of processes that dequeues the one with the shortest execution time.
+
+  The processes are kept in a heap keyed by (execution time, arrival
+  number), so enqueue and dequeue are O(log n) and processes with the
+  same execution time leave in order of arrival.
+  """
+
+  def __init__(self):
+    """Create an empty queue."""
+    self._heap = []                            # [execution time, number, process]
+    self._count = 0                            # number of processes enqueued
+
+  def __len__(self):
+    """Return the number of processes in the queue."""
+    return len(self._heap)
+
+  def is_empty(self):
+    """Return True if the queue is empty."""
+    return len(self._heap) == 0
+
+  def first(self):
+    """Return (but do not remove) the next process to leave the queue.
+
+    Raise Empty exception if the queue is empty.
+    """
+    if self.is_empty():
+      raise Empty('Queue is empty')
+    return self._heap[0][-1]
+
+  def dequeue(self):
+    """Remove and return the process with the shortest execution time.
+
+    Raise Empty exception if the queue is empty.
+    """
+    if self.is_empty():
+      raise Empty('Queue is empty')
+    return heappop(self._heap)[-1]
+
+  def enqueue(self, process):
+    """Add a process to the queue."""
+    heappush(self._heap, [process.execution_time, self._count, process])
+    self._count += 1
+
+class PriorityAgingQueue:
+  """Queue of processes with shortest-job-first priority and aging.
+
+  The priority of a process is its execution time minus rate times the
+  time it has been waiting, so long processes are not postponed forever.
+  At any moment t that is (execution_time + rate * start_time) - rate * t,
+  and the last term is the same for all the processes, so the order only
+  depends on the static key execution_time + rate * start_time: a plain
+  heap with that key gives the process with the best priority in O(log n)
+  without updating the keys as time goes by.
+  """
+
+  def __init__(self, rate=1.0):
+    """Create an empty queue whose priorities grow rate units per tick."""
+    self._rate = rate
+    self._heap = []                            # [key, number, process]
+    self._count = 0                            # number of processes enqueued
+
+  def __len__(self):
+    """Return the number of processes in the queue."""
+    return len(self._heap)
+
+  def is_empty(self):
+    """Return True if the queue is empty."""
+    return len(self._heap) == 0
+
+  def first(self):
+    """Return (but do not remove) the next process to leave the queue.
+
+    Raise Empty exception if the queue is empty.
+    """
+    if self.is_empty():
+      raise Empty('Queue is empty')
+    return self._heap[0][-1]
+
+  def dequeue(self):
+    """Remove and return the process with the best aged priority.
+
+    Raise Empty exception if the queue is empty.
+    """
+    if self.is_empty():
+      raise Empty('Queue is empty')
+    return heappop(self._heap)[-1]
+
+  def enqueue(self, process):
+    """Add a process, aged from the moment it entered the queue manager."""
+    key = process.execution_time + self._rate * process.start_time
+    heappush(self._heap, [key, self._count, process])
+    self._count += 1
+
+class FairShareQueue:
+  """Queue of processes that shares the executions fairly among users.
+
+  Each user has its own FIFO queue of processes, and the users with
+  waiting processes are kept in an indexed heap keyed by (usage, arrival
+  number of their oldest process), where usage is the execution time of
+  the processes of the user that have already left the queue.  The next
+  process is the oldest one of the user with the least usage.  The
+  locator of every user in the heap allows updating its key after a
+  dequeue in O(log u) for u users, instead of searching it.
+  """
+
+  #-------------------------- nested _Locator class --------------------------
+  class _Locator:
+    """Entry of the heap that remembers its own index."""
+    __slots__ = '_key', '_user', '_index'      # streamline memory usage
+
+    def __init__(self, key, user, index):
+      self._key = key
+      self._user = user
+      self._index = index
+
+  #------------------------------- utility methods -------------------------------
+  def __init__(self):
+    """Create an empty queue."""
+    self._heap = []                            # _Locator of the users waiting
+    self._locators = {}                        # user -> its _Locator (if waiting)
+    self._queues = {}                          # user -> ArrayQueue of [number, process]
+    self._usage = {}                           # user -> execution time used
+    self._count = 0                            # number of processes enqueued
+    self._size = 0
+
+  def _swap(self, i, j):
+    """Swap the entries at indices i and j of the heap."""
+    self._heap[i], self._heap[j] = self._heap[j], self._heap[i]
+    self._heap[i]._index = i
+    self._heap[j]._index = j
+
+  def _upheap(self, j):
+    """Move the entry at index j up to its place."""
+    parent = (j - 1) // 2
+    if j > 0 and self._heap[j]._key < self._heap[parent]._key:
+      self._swap(j, parent)
+      self._upheap(parent)
+
+  def _downheap(self, j):
+    """Move the entry at index j down to its place."""
+    left, right = 2 * j + 1, 2 * j + 2
+    if left < len(self._heap):
+      small = left
+      if right < len(self._heap) and self._heap[right]._key < self._heap[left]._key:
+        small = right
+      if self._heap[small]._key < self._heap[j]._key:
+        self._swap(j, small)
+        self._downheap(small)
+
+  def _key(self, user):
+    """Return the key of a user with waiting processes."""
+    return (self._usage.get(user, 0), self._queues[user].first()[0])
+
+  #------------------------------- public methods -------------------------------
+  def __len__(self):
+    """Return the number of processes in the queue."""
+    return self._size
+
+  def is_empty(self):
+    """Return True if the queue is empty."""
+    return self._size == 0
+
+  def first(self):
+    """Return (but do not remove) the next process to leave the queue.
+
+    Raise Empty exception if the queue is empty.
+    """
+    if self.is_empty():
+      raise Empty('Queue is empty')
+    return self._queues[self._heap[0]._user].first()[1]
+
+  def enqueue(self, process):
+    """Add a process to the queue of its user."""
+    user = process.user_id
+    queue = self._queues.get(user)
+    if queue is None:
+      queue = self._queues[user] = ArrayQueue()
+    queue.enqueue([self._count, process])
+    self._count += 1
+    self._size += 1
+    if user not in self._locators:             # the user starts waiting
+      locator = self._Locator(self._key(user), user, len(self._heap))
+      self._locators[user] = locator
+      self._heap.append(locator)
+      self._upheap(len(self._heap) - 1)
+
+  def dequeue(self):
+    """Remove and return the oldest process of the user with least usage.
+
+    Raise Empty exception if the queue is empty.
+    """
+    if self.is_empty():
+      raise Empty('Queue is empty')
+    locator = self._heap[0]
+    user = locator._user
+    process = self._queues[user].dequeue()[1]
+    self._size -= 1
+    self._usage[user] = self._usage.get(user, 0) + process.execution_time
+    if self._queues[user].is_empty():          # the user stops waiting
+      self._swap(0, len(self._heap) - 1)
+      self._heap.pop()
+      del self._locators[user]
+      del self._queues[user]
+      if self._heap:
+        self._downheap(0)
+    else:                                      # its key can only grow
+      locator._key = self._key(user)
+      self._downheap(0)
+    return process
+
+POLICIES = {"fifo": ArrayQueue, "sjf": ShortestJobFirstQueue, "fair": FairShareQueue, "aging": PriorityAgingQueue}
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019, Profesorado de Fundamentos de Programación II
+#                 Grado en Ciencia e Ingeneiría de Datos
+#                 Facultade de Informática
+#                 Universidade da Coruña
+#
+# based on:
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from bisect import bisect_left, bisect_right
+from heapq import merge
+
+class ArrayOrderedPositionalList:
+  """An ordered sequential container of elements stored in a Python list.
+
+  Elements are kept in nondecreasing order: add() finds the place of each
+  new element by binary search, after all the elements that are less than
+  or equal to it.  Positions remain valid while the list grows, because
+  they refer to the stored item and not to its index.
+  """
+
+  #-------------------------- nested _Item class --------------------------
+  class _Item:
+    """Lightweight, nonpublic class for storing an element and its index."""
+    __slots__ = '_element', '_index'           # streamline memory usage
+
+    def __init__(self, element, index):
+      self._element = element
+      self._index = index                      # -1 once the item is deleted
+
+  #-------------------------- nested Position class --------------------------
+  class Position:
+    """An abstraction representing the location of a single element.
+
+    Note that two position instaces may represent the same inherent
+    location in the list.  Therefore, users should always rely on
+    syntax 'p == q' rather than 'p is q' when testing equivalence of
+    positions.
+    """
+
+    def __init__(self, container, item):
+      """Constructor should not be invoked by user."""
+      self._container = container
+      self._item = item
+
+    def element(self):
+      """Return the element stored at this Position."""
+      return self._item._element
+
+    def __eq__(self, other):
+      """Return True if other is a Position representing the same location."""
+      return type(other) is type(self) and other._item is self._item
+
+    def __ne__(self, other):
+      """Return True if other does not represent the same location."""
+      return not (self == other)               # opposite of __eq__
+
+  #------------------------------- utility methods -------------------------------
+  def __init__(self):
+    """Create an empty list."""
+    self._data = []                            # list of _Item instances
+    self._stale = None                         # first index not renumbered
+
+  @staticmethod
+  def _element_of(item):
+    """Return the element of an item (key used for binary search)."""
+    return item._element
+
+  def _renumber(self):
+    """Refresh the index stored in the items moved by the last insertions.
+
+    Insertions only record the first index that has moved, so a burst of
+    insertions costs a single renumbering when a Position is next used.
+    """
+    if self._stale is not None:
+      for k in range(self._stale, len(self._data)):
+        self._data[k]._index = k
+      self._stale = None
+
+  def _mark_stale(self, k):
+    """Record that the items from index k onwards have moved."""
+    if self._stale is None or k < self._stale:
+      self._stale = k
+
+  def _validate(self, p):
+    """Return position's index, or raise appropriate error if invalid."""
+    if not isinstance(p, self.Position):
+      raise TypeError('p must be proper Position type')
+    if p._container is not self:
+      raise ValueError('p does not belong to this container')
+    if p._item._index < 0:                     # convention for deleted items
+      raise ValueError('p is no longer valid')
+    self._renumber()
+    return p._item._index
+
+  def _make_position(self, k):
+    """Return Position instance for given index (or None if out of range)."""
+    if 0 <= k < len(self._data):
+      return self.Position(self, self._data[k])
+    else:
+      return None                              # boundary violation
+
+  #------------------------------- accessors -------------------------------
+  def __len__(self):
+    """Return the number of elements in the list."""
+    return len(self._data)
+
+  def is_empty(self):
+    """Return True if the list is empty."""
+    return len(self._data) == 0
+
+  def first(self):
+    """Return the first Position in the list (or None if list is empty)."""
+    return self._make_position(0)
+
+  def last(self):
+    """Return the last Position in the list (or None if list is empty)."""
+    return self._make_position(len(self._data) - 1)
+
+  def before(self, p):
+    """Return the Position just before Position p (or None if p is first)."""
+    return self._make_position(self._validate(p) - 1)
+
+  def after(self, p):
+    """Return the Position just after Position p (or None if p is last)."""
+    return self._make_position(self._validate(p) + 1)
+
+  def find(self, e):
+    """Return the Position of element e (the same object), or None.
+
+    The first element equal to e is found by binary search.
+    """
+    k = bisect_left(self._data, e, key=self._element_of)
+    while k < len(self._data) and not (e < self._data[k]._element):
+      if self._data[k]._element is e:
+        return self.Position(self, self._data[k])
+      k += 1                                   # other elements equal to e
+    return None
+
+  def find_all(self, elements):
+    """Return the Positions of the given elements (the same objects).
+
+    Each element is found with its own binary search, as find() does.
+    The Positions are returned in the order of the elements (None for the
+    ones that are not in the list).
+    """
+    return [self.find(e) for e in elements]
+
+  def __iter__(self):
+    """Generate a forward iteration of the elements of the list."""
+    for item in self._data:
+      yield item._element
+
+  #------------------------------- mutators -------------------------------
+  def add(self, e):
+    """Insert element e in its ordered place and return its new Position.
+
+    The place is found by binary search, so an insertion makes O(log n)
+    comparisons (plus the shift of the underlying Python list).
+    """
+    k = bisect_right(self._data, e, key=self._element_of)
+    item = self._Item(e, k)
+    self._data.insert(k, item)
+    self._mark_stale(k + 1)
+    return self.Position(self, item)
+
+  def add_all(self, elements, key=None, presorted=False):
+    """Insert every element of the (unsorted) iterable in its ordered place.
+
+    The batch is sorted once and merged with the current contents into a
+    new array in linear time, so loading n elements costs O(n log n).
+    Elements equal to ones already stored are placed after them, as add()
+    does.  The optional key is used to sort the batch and must agree with
+    the elements' ordering.  If presorted is True the batch is trusted to
+    be already sorted and it is not sorted again.
+    """
+    if not presorted:
+      elements = sorted(elements, key=key)
+    batch = [self._Item(e, -1) for e in elements]
+    if key is None:
+      item_key = self._element_of
+    else:
+      item_key = lambda item: key(item._element)
+    # merge() is stable: on ties the items already stored come first
+    self._data = list(merge(self._data, batch, key=item_key))
+    self._stale = 0
+    self._renumber()
+
+  def delete(self, p):
+    """Remove and return the element at Position p."""
+    k = self._validate(p)
+    item = self._data.pop(k)
+    self._mark_stale(k)
+    item._index = -1                           # deprecate item
+    return item._element
+
+  def delete_all(self, positions):
+    """Remove the elements at all the given Positions and return them.
+
+    Deleting them one by one would shift the array and renumber its items
+    each time, O(n) per deletion.  Instead the deleted items are marked and
+    the array is rebuilt without them in a single linear pass.  All the
+    Positions are validated (and must be distinct) before any is deleted.
+    """
+    items = {}                                 # id -> item, in order
+    for p in positions:
+      self._validate(p)                        # renumbers at most once
+      if id(p._item) in items:
+        raise ValueError('p is repeated')
+      items[id(p._item)] = p._item
+    elements = []
+    for item in items.values():
+      item._index = -1                         # deprecate item
+      elements.append(item._element)
+    self._data = [item for item in self._data if item._index >= 0]
+    self._stale = 0
+    self._renumber()
+    return elements
+
+  def replace(self, p, e):
+    """Replace the element at Position p with e.
+
+    Return the element formerly at Position p.  The caller is responsible
+    for keeping the list ordered.
+    """
+    self._validate(p)
+    old_value = p._item._element               # temporarily store old element
+    p._item._element = e                       # replace with new element
+    return old_value                           # return the old element value
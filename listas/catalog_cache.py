@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Santrich Escalona, Elizabet
+(elizabet.santrich.escalona@udc.es)
+Rodríguez Polín, Isabel
+(isabel.rodriguezp@udc.es)
+
+Binary sidecar files with an already parsed catalog of films.
+
+The sidecar of a catalog "films.txt" is "films.txt.cache". It stores the movies of the catalog already sorted (by director, release year and title) and
+the positions of the movies that remain after removing the duplicates, so reopening an unchanged catalog does not need to parse, sort or deduplicate it again.
+The data is stored in columns (typed arrays), and it is read through a memory map of the file:
+
+    header   : magic, size and mtime of the catalog, sha256 of the catalog, number of films, unique films and directors
+    directors: offsets (uint64) and UTF-8 text of the distinct directors
+    titles   : offsets (uint64) and UTF-8 text of the titles of the films
+    columns  : director number (uint32), release year (int32) and score (float64) of each film
+    unique   : numbers (uint32) of the films of the catalog without duplicates, in order
+
+The sidecar is only used if the catalog has the same size and modification time it had when the sidecar was written or, if the modification time has
+changed, the same content (sha256).
+"""
+
+from array import array
+from hashlib import sha256
+import mmap
+import os
+import struct
+import sys
+
+MAGIC = b"FILMCAT1"
+HEADER = struct.Struct("<8sQq32sIII")
+ALIGNMENT = 8
+
+def cache_name(film_catalog: str) -> str:
+    """
+    Returns the name of the sidecar file of a catalog.
+
+    Parameters
+    ----------
+    film_catalog : str
+        Name of the catalog file.
+
+    Returns
+    -------
+    str
+        Name of its sidecar file.
+    """
+    return film_catalog + ".cache"
+
+def file_digest(film_catalog: str) -> bytes:
+    """
+    Calculates the sha256 of the content of a file, reading it in blocks.
+
+    Parameters
+    ----------
+    film_catalog : str
+        Name of the file.
+
+    Returns
+    -------
+    bytes
+        The 32 bytes of the digest.
+    """
+    digest = sha256()
+    with open(film_catalog, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.digest()
+
+def _little_endian(values: array) -> array:
+    """
+    Returns the array with its items in little endian byte order (the order used in the sidecar).
+    """
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+def _padding(size: int) -> bytes:
+    """
+    Returns the zero bytes needed after a section of the given size so that the next section starts aligned.
+    """
+    return b"\0" * (-size % ALIGNMENT)
+
+def write_cache(film_catalog: str, films: list, unique_films: list) -> None:
+    """
+    Writes the sidecar file of a catalog.
+
+    Parameters
+    ----------
+    film_catalog : str
+        Name of the catalog file.
+    films : list
+        All the Films of the catalog, sorted.
+    unique_films : list
+        The Films of the catalog without duplicates (each of them must be one of the objects of films).
+
+    Returns
+    -------
+    None
+    """
+    stat = os.stat(film_catalog)
+    digest = file_digest(film_catalog)
+    directors = {}
+    director_ids = array("I")
+    titles = []
+    years = array("i")
+    scores = array("d")
+    position = {}
+    for i, film in enumerate(films):
+        director_ids.append(directors.setdefault(film.director, len(directors)))
+        titles.append(film.title)
+        years.append(film.release_year)
+        scores.append(film.score)
+        position[id(film)] = i
+    unique = array("I", [position[id(film)] for film in unique_films])
+
+    with open(cache_name(film_catalog), "wb") as f:
+        f.write(HEADER.pack(MAGIC, stat.st_size, stat.st_mtime_ns, digest, len(films), len(unique), len(directors)))
+        f.write(_padding(HEADER.size))
+        for strings in (list(directors), titles):
+            blobs = [s.encode("utf-8") for s in strings]
+            offsets = array("Q", [0])
+            for blob in blobs:
+                offsets.append(offsets[-1] + len(blob))
+            f.write(_little_endian(offsets).tobytes())
+            f.write(b"".join(blobs))
+            f.write(_padding(offsets[-1]))
+        for column in (director_ids, years, scores, unique):
+            data = _little_endian(column).tobytes()
+            f.write(data)
+            f.write(_padding(len(data)))
+
+def read_cache(film_catalog: str, film_class) -> tuple:
+    """
+    Reads the sidecar file of a catalog, if it exists and it is still valid for the catalog.
+
+    Parameters
+    ----------
+    film_catalog : str
+        Name of the catalog file.
+    film_class : class
+        Class used to create the films (Film).
+
+    Returns
+    -------
+    tuple
+        A tuple (films, unique_films) with the sorted Films of the catalog and the Films without duplicates (as written by write_cache),
+        or None if there is no valid sidecar for the catalog.
+    """
+    try:
+        f = open(cache_name(film_catalog), "rb")
+    except OSError:
+        return None
+    with f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:                     # empty file
+            return None
+    with data:
+        if len(data) < HEADER.size:
+            return None
+        magic, size, mtime_ns, digest, n_films, n_unique, n_directors = HEADER.unpack_from(data, 0)
+        stat = os.stat(film_catalog)
+        if magic != MAGIC or size != stat.st_size:
+            return None
+        if mtime_ns != stat.st_mtime_ns and digest != file_digest(film_catalog):
+            return None
+
+        offset = HEADER.size + len(_padding(HEADER.size))
+
+        def column(typecode: str, count: int) -> array:
+            # Reads the next section of the memory map as a typed array
+            nonlocal offset
+            values = array(typecode)
+            nbytes = values.itemsize * count
+            if offset + nbytes > len(data):
+                raise ValueError("Truncated sidecar file")
+            values.frombytes(data[offset:offset + nbytes])
+            if sys.byteorder != "little":
+                values.byteswap()
+            offset += nbytes + len(_padding(nbytes))
+            return values
+
+        def strings(count: int) -> list:
+            # Decodes the next section of offsets and text
+            nonlocal offset
+            offsets = column("Q", count + 1)
+            start = offset
+            result = [data[start + offsets[i]:start + offsets[i + 1]].decode("utf-8") for i in range(count)]
+            offset += offsets[count] + len(_padding(offsets[count]))
+            return result
+
+        try:
+            directors = strings(n_directors)
+            titles = strings(n_films)
+            director_ids = column("I", n_films)
+            years = column("i", n_films)
+            scores = column("d", n_films)
+            unique = column("I", n_unique)
+        except ValueError:                     # truncated or corrupted sidecar
+            return None
+
+    films = [film_class(directors[director_ids[i]], titles[i], years[i], scores[i]) for i in range(n_films)]
+    unique_films = [films[i] for i in unique]
+    return films, unique_films
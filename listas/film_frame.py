@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+Santrich Escalona, Elizabet
+(elizabet.santrich.escalona@udc.es)
+Rodríguez Polín, Isabel
+(isabel.rodriguezp@udc.es)
+
+Catalog of films stored in a pandas DataFrame.
+
+All the work is done with vectorized operations on the columns of the DataFrame: the lines of the catalog files are split in their four attributes with a
+single str.split, the movies are sorted by director, release year and title with a single sort_values, the duplicates are removed with drop_duplicates, and the statistics are calculated with groupby.
+Like a FilmTable, a FilmFrame can be used as the (read-only) catalog of a Film_Manager: the Film objects are only created for the movies that are returned.
+"""
+
+import pandas
+
+COLUMNS = ["Director", "Title", "Release year", "Score"]
+SORT_KEY = ["Director", "Release year", "Title"]
+
+class FilmFrame:
+    """
+    Read-only ordered catalog of films stored in a DataFrame, with the columns "Director", "Title", "Release year" and "Score", sorted by director, release year
+    and title.
+
+    It offers the same interface as FilmTable: it can be traversed like the ordered positional lists (len, is_empty and iteration in order, yielding Films) and it
+    answers the queries by director and by release year. Besides, it gives the statistics of its movies as the CatalogStats of a Film_Manager, with a groupby of
+    its columns.
+
+    Usage Example:
+        frame = FilmFrame.from_catalogs(["films.txt"], Film)
+        unique_frame = frame.unique()      # without duplicates
+
+    Methods
+    -------
+    Public Methods:
+        from_catalogs(cls, film_catalogs: list, film_class) -> FilmFrame:
+            Reads one or more catalog files into a new frame.
+
+        film(self, k: int):
+            Returns the k-th Film of the frame, in order.
+
+        unique(self) -> FilmFrame:
+            Returns a frame without duplicated movies.
+
+        directors(self) -> list:
+            Returns the distinct directors of the movies of the frame.
+
+        titles(self):
+            Returns the titles of the movies of the frame, in order.
+
+        films_by_director_range(self, first: str, last: str) -> list:
+            Returns the Films whose director is in the range [first, last].
+
+        films_by_director(self, director: str) -> list:
+            Returns the Films of a director.
+
+        films_by_director_prefix(self, prefix: str) -> list:
+            Returns the Films whose director starts with the prefix.
+
+        films_by_year(self, year: int) -> list:
+            Returns the Films released in a year.
+
+        director_frame(self) -> pandas.DataFrame:
+            Returns a DataFrame with the number of films and the mean score of each director.
+
+        year_frame(self) -> pandas.DataFrame:
+            Returns a DataFrame with the mean score of each release year.
+    """
+
+    def __init__(self, film_class, frame: pandas.DataFrame):
+        """
+        Creates a catalog from a DataFrame that is already sorted (use from_catalogs() to read a catalog file).
+
+        Parameters
+        ----------
+        film_class : class
+            Class used to materialize the films (Film).
+        frame : pandas.DataFrame
+            The movies, with the columns "Director", "Title", "Release year" and "Score", sorted by director, release year and title, and with a default
+            index (0, 1, 2...).
+
+        Returns
+        -------
+        None.
+        """
+        self._film_class = film_class
+        self._frame = frame
+
+    @classmethod
+    def from_catalogs(cls, film_catalogs: list, film_class) -> "FilmFrame":
+        """
+        Reads the catalog files (in the same format as Film.from_line(): director; title; release year; score) into a new frame. The lines are split exactly as
+        Film.from_line() does, by the semicolon followed by a space (a vectorized str.split without regular expressions), so quotes and semicolons without a space
+        are kept in the titles; a CSV parser would take them as quoting characters or separators. Movies equal in all their attributes keep the order of the files
+        (the sort is stable), as in the ordered lists.
+
+        Parameters
+        ----------
+        film_catalogs : list
+            Names of the catalog files.
+        film_class : class
+            Class used to materialize the films (Film).
+
+        Returns
+        -------
+        FilmFrame
+            The frame with all the movies of the catalogs.
+
+        Raises
+        ------
+        ValueError
+            If a line does not have four attributes or the release year or the score of a movie are not numbers.
+        """
+        lines = []
+        for film_catalog in film_catalogs:
+            with open(film_catalog, encoding="utf-8") as f:
+                # Only "\n" ends a line, as when the file is iterated (splitlines() would also split at other separators, like U+2028)
+                lines.extend(f.read().split("\n"))
+        lines = pandas.Series(lines, dtype=object).str.strip()
+        # Lines with less than four attributes get missing values
+        fields = lines[lines != ""].str.split("; ", n=3, expand=True, regex=False).reindex(columns=range(len(COLUMNS)))
+        if fields.isna().any(axis=None):
+            raise ValueError("Every movie must have four attributes: director; title; release year; score")
+        fields.columns = COLUMNS
+        frame = fields.astype({"Release year": "int64", "Score": "float64"})
+        frame = frame.sort_values(SORT_KEY, kind="stable", ignore_index=True)
+        return cls(film_class, frame)
+
+    @property
+    def frame(self):
+        """
+        Gets the DataFrame with the movies.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The movies, sorted by director, release year and title.
+        """
+        return self._frame
+
+    def _films(self, frame: pandas.DataFrame) -> list:
+        """
+        Creates the Films of the rows of a part of the frame.
+        """
+        return [self._film_class(director, title, int(release_year), float(score))
+                for director, title, release_year, score in frame.itertuples(index=False, name=None)]
+
+    def __len__(self):
+        """
+        Returns the number of movies of the frame.
+        """
+        return len(self._frame)
+
+    def is_empty(self):
+        """
+        Returns True if the frame has no movies.
+        """
+        return len(self._frame) == 0
+
+    def __iter__(self):
+        """
+        Generates the Films of the frame in order, materializing them one by one.
+        """
+        for director, title, release_year, score in self._frame.itertuples(index=False, name=None):
+            yield self._film_class(director, title, int(release_year), float(score))
+
+    def film(self, k: int):
+        """
+        Returns the k-th Film of the frame, in order.
+
+        Parameters
+        ----------
+        k : int
+            Position of the Film (0 is the first one).
+
+        Returns
+        -------
+        Film
+            The materialized Film.
+        """
+        return self._films(self._frame.iloc[k:k + 1])[0]
+
+    def directors(self) -> list:
+        """
+        Returns the distinct directors of the movies of the frame.
+
+        Returns
+        -------
+        list
+            The directors, in order.
+        """
+        return self._frame["Director"].unique().tolist()
+
+    def titles(self):
+        """
+        Returns the titles of the movies of the frame, in order (a list taken from the column, without materializing the Films).
+        """
+        return self._frame["Title"].tolist()
+
+    def unique(self) -> "FilmFrame":
+        """
+        Returns a frame with only the movies that remain after removing the duplicates (same director and title): the version with the newest release year, the
+        first one if there are several with that year, as Film_Manager._delete_duplicated() does. The movies are sorted (stably) with the newest years first inside
+        each (director, title), drop_duplicates keeps the first row of each of them, and the rows are put back in their original order.
+
+        Returns
+        -------
+        FilmFrame
+            The frame without duplicates.
+        """
+        newest_first = self._frame.sort_values(["Director", "Title", "Release year"], ascending=[True, True, False], kind="stable")
+        unique = newest_first.drop_duplicates(["Director", "Title"]).sort_index()
+        return FilmFrame(self._film_class, unique.reset_index(drop=True))
+
+    def films_by_director_range(self, first: str, last: str) -> list:
+        """
+        Returns the Films whose director is between first and last (both included, in lexicographical order). The director column is sorted, so both limits are
+        found by binary search (searchsorted).
+
+        Parameters
+        ----------
+        first : str
+            The first director of the range.
+        last : str
+            The last director of the range.
+
+        Returns
+        -------
+        list
+            The Films of the directors of the range, in order.
+        """
+        directors = self._frame["Director"]
+        start = directors.searchsorted(first, side="left")
+        end = directors.searchsorted(last, side="right")
+        return self._films(self._frame.iloc[start:end])
+
+    def films_by_director(self, director: str) -> list:
+        """
+        Returns the Films of a director, ordered by release year and title.
+
+        Parameters
+        ----------
+        director : str
+            The name of the director (last name, first name).
+
+        Returns
+        -------
+        list
+            The Films of the director (empty if the director is not in the frame).
+        """
+        return self.films_by_director_range(director, director)
+
+    def films_by_director_prefix(self, prefix: str) -> list:
+        """
+        Returns the Films whose director starts with the given prefix. They are consecutive in the frame and they are less than the prefix followed by the last
+        Unicode character, so both limits are found with searchsorted (and the rows between them are checked with a vectorized startswith).
+
+        Parameters
+        ----------
+        prefix : str
+            The beginning of the name of the director.
+
+        Returns
+        -------
+        list
+            The Films of the directors with that prefix, in order.
+        """
+        directors = self._frame["Director"]
+        start = directors.searchsorted(prefix, side="left")
+        end = directors.searchsorted(prefix + "\U0010ffff", side="left")
+        candidates = self._frame.iloc[start:end]
+        return self._films(candidates[candidates["Director"].str.startswith(prefix)])
+
+    def films_by_year(self, year: int) -> list:
+        """
+        Returns the Films released in a year, ordered by director and title (the order of the frame), selecting the rows with a vectorized comparison.
+
+        Parameters
+        ----------
+        year : int
+            The release year.
+
+        Returns
+        -------
+        list
+            The Films released that year.
+        """
+        return self._films(self._frame[self._frame["Release year"] == year])
+
+    def director_frame(self) -> pandas.DataFrame:
+        """
+        Returns a DataFrame, indexed (and ordered) by director, with the number of films and the mean score of each director (the same as
+        CatalogStats.director_frame()), calculated with a groupby of the frame.
+
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame with the columns ("Films", "count") and ("Score", "mean").
+        """
+        scores = self._frame.groupby("Director")["Score"]
+        return pandas.DataFrame({("Films", "count"): scores.count(), ("Score", "mean"): scores.mean()})
+
+    def year_frame(self) -> pandas.DataFrame:
+        """
+        Returns a DataFrame, indexed (and ordered) by release year, with the mean score of the Films of each year (the same as CatalogStats.year_frame()),
+        calculated with a groupby of the frame.
+
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame with the column ("Score", "mean").
+        """
+        return pandas.DataFrame({("Score", "mean"): self._frame.groupby("Release year")["Score"].mean()})
@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+"""
+Santrich Escalona, Elizabet
+(elizabet.santrich.escalona@udc.es)
+Rodríguez Polín, Isabel
+(isabel.rodriguezp@udc.es)
+
+Columnar storage of a catalog of films.
+
+Instead of one Film object per movie (with its own __dict__ and the node of the ordered list that stores it), a FilmTable keeps the attributes of the
+movies in columns:
+
+    directors : the distinct directors (interned strings), numbered in order of appearance
+    director  : number (uint32) of the director of each movie
+    titles    : all the titles concatenated in a single string, with the offset (uint64) where each one starts
+    year      : release year (int32) of each movie
+    score     : score (float64) of each movie
+    order     : permutation (uint32) with the numbers of the movies ordered by director, release year and title
+
+so each movie takes a few tens of bytes. The Film objects are only created (materialized) when they are needed, for example when a query result is printed.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+import sys
+
+class FilmTable:
+    """
+    Read-only ordered catalog of films stored in columns (typed arrays).
+
+    It can be traversed like the ordered positional lists (len, is_empty and iteration in order, yielding Films), and it answers the queries by director and by release
+    year with binary searches on its order permutations, so it can be used as the catalog of a Film_Manager (whose CatalogStats keep the statistics of its
+    movies).
+
+    Usage Example:
+        table = FilmTable.from_catalogs(["films.txt"], Film)
+        unique_table = table.unique()      # same columns, without duplicates
+
+    Methods
+    -------
+    Public Methods:
+        from_catalogs(cls, film_catalogs: list, film_class) -> FilmTable:
+            Reads one or more catalog files into a new table.
+
+        film(self, k: int):
+            Returns the k-th Film of the table, in order.
+
+        unique(self) -> FilmTable:
+            Returns a table with the same columns and without duplicated movies.
+
+        directors(self) -> list:
+            Returns the distinct directors of the movies of the table.
+
+        titles(self):
+            Generates the titles of the movies of the table, in order.
+
+        films_by_director_range(self, first: str, last: str) -> list:
+            Returns the Films whose director is in the range [first, last].
+
+        films_by_director(self, director: str) -> list:
+            Returns the Films of a director.
+
+        films_by_director_prefix(self, prefix: str) -> list:
+            Returns the Films whose director starts with the prefix.
+
+        films_by_year(self, year: int) -> list:
+            Returns the Films released in a year.
+    """
+
+    def __init__(self, film_class, directors: list, director_ids: array, titles: str, title_offsets: array, years: array, scores: array, order: array):
+        """
+        Creates a table from its columns (use from_catalogs() to read a catalog file).
+
+        Parameters
+        ----------
+        film_class : class
+            Class used to materialize the films (Film).
+        directors : list
+            The distinct directors.
+        director_ids : array
+            Number of the director of each movie (uint32).
+        titles : str
+            The titles of the movies concatenated.
+        title_offsets : array
+            Offset of the title of each movie in titles, plus the length of titles (uint64).
+        years : array
+            Release year of each movie (int32).
+        scores : array
+            Score of each movie (float64).
+        order : array
+            Numbers of the movies of the table, in order (uint32).
+
+        Returns
+        -------
+        None.
+        """
+        self._film_class = film_class
+        self._directors = directors
+        self._director_ids = director_ids
+        self._titles = titles
+        self._title_offsets = title_offsets
+        self._years = years
+        self._scores = scores
+        self._order = order
+        self._year_order = None             # order by release year, built when it is needed
+
+    @classmethod
+    def from_catalogs(cls, film_catalogs: list, film_class) -> "FilmTable":
+        """
+        Reads the catalog files (in the same format as Film.from_line(): director; title; release year; score) into a new table. Movies equal in all their
+        attributes keep the order of the files, as in the ordered lists.
+
+        Parameters
+        ----------
+        film_catalogs : list
+            Names of the catalog files.
+        film_class : class
+            Class used to materialize the films (Film).
+
+        Returns
+        -------
+        FilmTable
+            The table with all the movies of the catalogs.
+
+        Raises
+        ------
+        ValueError
+            If a line does not have four attributes or the release year or the score are not numbers.
+        """
+        numbers = {}                        # director -> number
+        directors = []
+        director_ids = array("I")
+        titles = []
+        years = array("i")
+        scores = array("d")
+        for film_catalog in film_catalogs:
+            with open(film_catalog, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    director, title, release_year, score = line.split('; ')
+                    number = numbers.get(director)
+                    if number is None:
+                        number = numbers[director] = len(directors)
+                        directors.append(sys.intern(director))
+                    director_ids.append(number)
+                    titles.append(title)
+                    years.append(int(release_year))
+                    scores.append(float(score))
+
+        # Directors are compared by their rank, so the sort keys do not hold the strings of the directors
+        rank = [0] * len(directors)
+        for k, number in enumerate(sorted(range(len(directors)), key=directors.__getitem__)):
+            rank[number] = k
+        order = array("I", sorted(range(len(titles)), key=lambda i: (rank[director_ids[i]], years[i], titles[i])))
+
+        title_offsets = array("Q", [0])
+        for title in titles:
+            title_offsets.append(title_offsets[-1] + len(title))
+        return cls(film_class, directors, director_ids, "".join(titles), title_offsets, years, scores, order)
+
+    def _director(self, i: int) -> str:
+        """
+        Returns the director of the movie number i.
+        """
+        return self._directors[self._director_ids[i]]
+
+    def _title(self, i: int) -> str:
+        """
+        Returns the title of the movie number i (a slice of the string with all the titles).
+        """
+        return self._titles[self._title_offsets[i]:self._title_offsets[i + 1]]
+
+    def _materialize(self, i: int):
+        """
+        Creates the Film of the movie number i.
+        """
+        return self._film_class(self._director(i), self._title(i), self._years[i], self._scores[i])
+
+    def _with_order(self, order: array) -> "FilmTable":
+        """
+        Returns a table that shares the columns of this one, with other movies or in another order.
+        """
+        return FilmTable(self._film_class, self._directors, self._director_ids, self._titles, self._title_offsets, self._years, self._scores, order)
+
+    def __len__(self):
+        """
+        Returns the number of movies of the table.
+        """
+        return len(self._order)
+
+    def is_empty(self):
+        """
+        Returns True if the table has no movies.
+        """
+        return len(self._order) == 0
+
+    def __iter__(self):
+        """
+        Generates the Films of the table in order, materializing them one by one.
+        """
+        for i in self._order:
+            yield self._materialize(i)
+
+    def film(self, k: int):
+        """
+        Returns the k-th Film of the table, in order.
+
+        Parameters
+        ----------
+        k : int
+            Position of the Film (0 is the first one).
+
+        Returns
+        -------
+        Film
+            The materialized Film.
+        """
+        return self._materialize(self._order[k])
+
+    def directors(self) -> list:
+        """
+        Returns the distinct directors of the movies of the table (without materializing the Films).
+
+        Returns
+        -------
+        list
+            The directors, in order of appearance in the catalogs.
+        """
+        numbers = set(map(self._director_ids.__getitem__, self._order))
+        return [self._directors[number] for number in sorted(numbers)]
+
+    def titles(self):
+        """
+        Generates the titles of the movies of the table, in order, as slices of the string with all the titles (without materializing the Films).
+        """
+        for i in self._order:
+            yield self._title(i)
+
+    def unique(self) -> "FilmTable":
+        """
+        Returns a table with the same columns and only the movies that remain after removing the duplicates (same director and title): the version with the
+        newest release year, the first one if there are several with that year, as Film_Manager._delete_duplicated() does. The duplicates of a movie have the
+        same director, so the order is traversed once keeping only the titles of the current director.
+
+        Returns
+        -------
+        FilmTable
+            The table without duplicates (it shares the columns with this one, only its order permutation is new).
+        """
+        years = self._years
+        order = array("I")
+        director = None
+        kept = {}                           # title -> number of the newest movie of the current director
+        for i in self._order:
+            if self._director_ids[i] != director:
+                order.extend(sorted(kept.values(), key=lambda j: (years[j], self._title(j))))
+                director = self._director_ids[i]
+                kept = {}
+            title = self._title(i)
+            other = kept.get(title)
+            if other is None or years[other] < years[i]:
+                kept[title] = i
+        order.extend(sorted(kept.values(), key=lambda j: (years[j], self._title(j))))
+        return self._with_order(order)
+
+    def films_by_director_range(self, first: str, last: str) -> list:
+        """
+        Returns the Films whose director is between first and last (both included, in lexicographical order). Both limits are found by binary search in the
+        order permutation, so only the Films returned are materialized.
+
+        Parameters
+        ----------
+        first : str
+            The first director of the range.
+        last : str
+            The last director of the range.
+
+        Returns
+        -------
+        list
+            The Films of the directors of the range, in order.
+        """
+        start = bisect_left(self._order, first, key=self._director)
+        end = bisect_right(self._order, last, key=self._director)
+        return [self._materialize(i) for i in self._order[start:end]]
+
+    def films_by_director(self, director: str) -> list:
+        """
+        Returns the Films of a director, ordered by release year and title.
+
+        Parameters
+        ----------
+        director : str
+            The name of the director (last name, first name).
+
+        Returns
+        -------
+        list
+            The Films of the director (empty if the director is not in the table).
+        """
+        return self.films_by_director_range(director, director)
+
+    def films_by_director_prefix(self, prefix: str) -> list:
+        """
+        Returns the Films whose director starts with the given prefix. They are consecutive in the order, so the first one is found by binary search.
+
+        Parameters
+        ----------
+        prefix : str
+            The beginning of the name of the director.
+
+        Returns
+        -------
+        list
+            The Films of the directors with that prefix, in order.
+        """
+        films = []
+        k = bisect_left(self._order, prefix, key=self._director)
+        while k < len(self._order) and self._director(self._order[k]).startswith(prefix):
+            films.append(self._materialize(self._order[k]))
+            k += 1
+        return films
+
+    def films_by_year(self, year: int) -> list:
+        """
+        Returns the Films released in a year, ordered by director and title. The first time, a second permutation ordered by release year is built (a stable sort
+        of the order, so the movies of each year keep their order); then the year is found by binary search.
+
+        Parameters
+        ----------
+        year : int
+            The release year.
+
+        Returns
+        -------
+        list
+            The Films released that year.
+        """
+        if self._year_order is None:
+            self._year_order = array("I", sorted(self._order, key=self._years.__getitem__))
+        start = bisect_left(self._year_order, year, key=self._years.__getitem__)
+        end = bisect_right(self._year_order, year, key=self._years.__getitem__)
+        return [self._materialize(i) for i in self._year_order[start:end]]
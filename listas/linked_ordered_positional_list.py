@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+# Copyright 2019, Profesorado de Fundamentos de Programación II
+#                 Grado en Ciencia e Ingeneiría de Datos
+#                 Facultade de Informática
+#                 Universidade da Coruña
+#
+# based on:
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+class LinkedOrderedPositionalList:
+  """An ordered sequential container of elements allowing positional access.
+
+  Elements are kept in nondecreasing order: add() places each new element
+  after all the elements that are less than or equal to it.
+  """
+
+  #-------------------------- nested _Node class --------------------------
+  class _Node:
+    """Lightweight, nonpublic class for storing a doubly linked node."""
+    __slots__ = '_element', '_prev', '_next'            # streamline memory
+
+    def __init__(self, element, prev, next):            # initialize node's fields
+      self._element = element                           # user's element
+      self._prev = prev                                 # previous node reference
+      self._next = next                                 # next node reference
+
+  #-------------------------- nested Position class --------------------------
+  class Position:
+    """An abstraction representing the location of a single element.
+
+    Note that two position instaces may represent the same inherent
+    location in the list.  Therefore, users should always rely on
+    syntax 'p == q' rather than 'p is q' when testing equivalence of
+    positions.
+    """
+
+    def __init__(self, container, node):
+      """Constructor should not be invoked by user."""
+      self._container = container
+      self._node = node
+
+    def element(self):
+      """Return the element stored at this Position."""
+      return self._node._element
+
+    def __eq__(self, other):
+      """Return True if other is a Position representing the same location."""
+      return type(other) is type(self) and other._node is self._node
+
+    def __ne__(self, other):
+      """Return True if other does not represent the same location."""
+      return not (self == other)               # opposite of __eq__
+
+  #------------------------------- utility methods -------------------------------
+  def __init__(self):
+    """Create an empty list."""
+    self._header = self._Node(None, None, None)
+    self._trailer = self._Node(None, None, None)
+    self._header._next = self._trailer                  # trailer is after header
+    self._trailer._prev = self._header                  # header is before trailer
+    self._size = 0                                      # number of elements
+
+  def _validate(self, p):
+    """Return position's node, or raise appropriate error if invalid."""
+    if not isinstance(p, self.Position):
+      raise TypeError('p must be proper Position type')
+    if p._container is not self:
+      raise ValueError('p does not belong to this container')
+    if p._node._next is None:                  # convention for deprecated nodes
+      raise ValueError('p is no longer valid')
+    return p._node
+
+  def _make_position(self, node):
+    """Return Position instance for given node (or None if sentinel)."""
+    if node is self._header or node is self._trailer:
+      return None                              # boundary violation
+    else:
+      return self.Position(self, node)         # legitimate position
+
+  def _insert_between(self, e, predecessor, successor):
+    """Add element between existing nodes and return new Position."""
+    newest = self._Node(e, predecessor, successor)      # linked to neighbors
+    predecessor._next = newest
+    successor._prev = newest
+    self._size += 1
+    return self._make_position(newest)
+
+  #------------------------------- accessors -------------------------------
+  def __len__(self):
+    """Return the number of elements in the list."""
+    return self._size
+
+  def is_empty(self):
+    """Return True if the list is empty."""
+    return self._size == 0
+
+  def first(self):
+    """Return the first Position in the list (or None if list is empty)."""
+    return self._make_position(self._header._next)
+
+  def last(self):
+    """Return the last Position in the list (or None if list is empty)."""
+    return self._make_position(self._trailer._prev)
+
+  def before(self, p):
+    """Return the Position just before Position p (or None if p is first)."""
+    node = self._validate(p)
+    return self._make_position(node._prev)
+
+  def after(self, p):
+    """Return the Position just after Position p (or None if p is last)."""
+    node = self._validate(p)
+    return self._make_position(node._next)
+
+  def find(self, e):
+    """Return the Position of element e (the same object), or None.
+
+    The list is walked from the front, so a search is O(n).
+    """
+    walk = self._header._next
+    while walk is not self._trailer and walk._element < e:
+      walk = walk._next
+    while walk is not self._trailer and not (e < walk._element):
+      if walk._element is e:
+        return self._make_position(walk)
+      walk = walk._next                        # other elements equal to e
+    return None
+
+  def find_all(self, elements):
+    """Return the Positions of the given elements (the same objects).
+
+    The list is walked from the front only once for the whole batch, so k
+    elements cost O(n + k) instead of the O(k n) of k calls to find().  The Positions
+    are returned in the order of the elements (None for the ones that are
+    not in the list).
+    """
+    wanted = {id(e): k for k, e in enumerate(elements)}
+    positions = [None] * len(wanted)
+    missing = len(wanted)
+    walk = self._header._next
+    while walk is not self._trailer and missing > 0:
+      k = wanted.get(id(walk._element))
+      if k is not None:
+        positions[k] = self._make_position(walk)
+        missing -= 1
+      walk = walk._next
+    return positions
+
+  def __iter__(self):
+    """Generate a forward iteration of the elements of the list."""
+    walk = self._header._next
+    while walk is not self._trailer:
+      yield walk._element
+      walk = walk._next
+
+  #------------------------------- mutators -------------------------------
+  def add(self, e):
+    """Insert element e in its ordered place and return its new Position.
+
+    The list is walked from the front, so a single insertion is O(n).
+    """
+    walk = self._header._next
+    while walk is not self._trailer and e >= walk._element:
+      walk = walk._next
+    return self._insert_between(e, walk._prev, walk)
+
+  def add_all(self, elements, key=None, presorted=False):
+    """Insert every element of the (unsorted) iterable in its ordered place.
+
+    The batch is sorted once and then merged with the current contents in
+    a single walk of the list, so loading n elements costs O(n log n)
+    instead of the O(n^2) of n calls to add().  Elements equal to ones
+    already stored are placed after them, as add() does.  The optional key
+    is used to sort the batch and must agree with the elements' ordering.
+    If presorted is True the batch is trusted to be already sorted and it
+    is not sorted again.
+    """
+    if not presorted:
+      elements = sorted(elements, key=key)     # sorted() is stable
+    walk = self._header._next
+    for e in elements:
+      while walk is not self._trailer and e >= walk._element:
+        walk = walk._next
+      self._insert_between(e, walk._prev, walk)
+
+  def delete(self, p):
+    """Remove and return the element at Position p."""
+    node = self._validate(p)
+    node._prev._next = node._next              # link out the node
+    node._next._prev = node._prev
+    self._size -= 1
+    element = node._element                    # record deleted element
+    node._prev = node._next = node._element = None      # deprecate node
+    return element
+
+  def delete_all(self, positions):
+    """Remove the elements at all the given Positions and return them.
+
+    Each node is unlinked in O(1).  All the Positions are validated (and must be
+    distinct) before any is deleted.
+    """
+    positions = list(positions)
+    nodes = set()
+    for p in positions:
+      node = self._validate(p)
+      if node in nodes:
+        raise ValueError('p is repeated')
+      nodes.add(node)
+    return [self.delete(p) for p in positions]
+
+  def replace(self, p, e):
+    """Replace the element at Position p with e.
+
+    Return the element formerly at Position p.  The caller is responsible
+    for keeping the list ordered.
+    """
+    original = self._validate(p)
+    old_value = original._element              # temporarily store old element
+    original._element = e                      # replace with new element
+    return old_value                           # return the old element value
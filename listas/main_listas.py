@@ -8,8 +8,24 @@ Rodríguez Polín, Isabel
  
 from array_ordered_positional_list import ArrayOrderedPositionalList
 from linked_ordered_positional_list import LinkedOrderedPositionalList 
+from skip_ordered_positional_list import SkipOrderedPositionalList
+from catalog_cache import read_cache, write_cache
+from film_frame import FilmFrame
+from film_table import FilmTable
+from trigram_index import TrigramIndex
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from heapq import merge, nlargest
+from operator import attrgetter, itemgetter
+import gzip
+import os
+import sys
+import time
 import pandas
- 
+
+# Key of the tuples (director, title, release year, score) equivalent to the sort_key of the Films
+ROW_KEY = itemgetter(0, 2, 1)
  
 class Film:
     """
@@ -28,10 +44,18 @@ class Film:
         The release year of the film.
     score : float
         The average score of the film.
+    sort_key : tuple
+        The tuple (director, release_year, title) used to order the films. It is computed once and refreshed by the setters of those attributes.
 
     Methods
     -------
     Dunder methods:
+        __lt__(self, other: Film) -> bool:
+            Compares if the current film is less than another film starting by comparing the director, then the release year, and finally the title.
+        
+        __le__(self, other: Film) -> bool:
+            Compares if the current film is less than or equal to another film starting by comparing the director, then the release year, and finally the title.
+        
         __ge__(self, other: Film) -> bool:
             Compares if the current film is greater than or equal to another film starting by comparing the director, then the release year, and finally the title.
         
@@ -41,8 +65,15 @@ class Film:
         __eq__(self, other: Film) -> bool:
             Compares if the current film is equal to another film based on the director and the title.
         
+        __hash__(self) -> int:
+            Returns the hash of the film based on the director and the title (consistent with __eq__).
+        
         __str__(self) -> str:
             Returns a string containing the concatenated information of the film (each attribute separated by ';').
+    
+    Class Methods:
+        from_line(cls, line: str) -> Film:
+            Creates a Film from a line of a catalog (director; title; release year; score).
 
     """
 
@@ -71,6 +102,8 @@ class Film:
         self._title = title
         self._release_year = release_year
         self._score = score
+        # Precomputed key used by all the comparisons (director, release year, title)
+        self._sort_key = (director, release_year, title)
 
     @property
     def director(self):
@@ -101,6 +134,7 @@ class Film:
         """
         if isinstance(value, str) and len(value) != 0 :
             self._director = value
+            self._sort_key = (value, self._release_year, self._title)
         else:
             raise ValueError("The name of the director must be a non empty string")
 
@@ -133,6 +167,7 @@ class Film:
         """
         if isinstance(value, str) and len(value) != 0:
             self._title = value
+            self._sort_key = (self._director, self._release_year, value)
         else:
             raise ValueError("The title of the film must be a non empty string")
     @property
@@ -164,6 +199,7 @@ class Film:
         """
         if isinstance(value, int) and value >= 0:
             self._release_year = value
+            self._sort_key = (self._director, value, self._title)
         else:
             raise ValueError("The release year must be a positive integer")
 
@@ -198,7 +234,44 @@ class Film:
             self._score = value
         else:
             raise ValueError("The score must be a positive float between 0 and 10")
+
+    @property
+    def sort_key(self):
+        """
+        Gets the key used to order the films: the director, then the release year and finally the title. It is an immutable tuple that is created once (and refreshed
+        when one of these attributes is changed), so it can be used as the key of sorted(), bisect or heapq to compare films at the speed of tuple comparison.
+ 
+        Returns
+        -------
+        tuple
+            The tuple (director, release_year, title) of the film.
+        """
+        return self._sort_key
             
+    @classmethod
+    def from_line(cls, line: str) -> "Film":
+        """
+        Creates a Film from a line of a catalog file, with its attributes separated by a semicolon and a space, in the same format returned by __str__:
+        director; title; release year; score
+        
+        Parameters
+        ----------
+        line : str
+            The line of the catalog (without the newline character).
+ 
+        Returns
+        -------
+        Film
+            The Film described by the line.
+        
+        Raises
+        ------
+        ValueError
+            If the line does not have four attributes or the release year or the score are not numbers.
+        """
+        director, title, release_year, score = line.split('; ')
+        return cls(director, title, int(release_year), float(score))
+
     def __str__(self):
         """
         Function that returns a string with the information of the Film, which is used to examine the data of a movie 
@@ -209,14 +282,49 @@ class Film:
         str
             String containing the data (atributes) of the Film (director; title; release year; score).
         """
-        return(f"{self.director}; {self.title}; {self.release_year}; {self.score}")
+        return(f"{self._director}; {self._title}; {self._release_year}; {self._score}")
     
+    def __lt__(self, other: "Film"):
+        """
+        This method is used to check if a Film is less than (<) another Film provided as a parameter (other). The films are compared by their sort_key, which is 
+        ordered by director (lexicographical ordering), then by release year and finally by title (lexicographical ordering).
+        
+        Parameters
+        ----------
+        other : "Film"
+            The Film being compared to the Film used to call the function, wanting to know if the latter is less than other.
+        
+        Returns
+        -------
+        boolean
+            True if Film < other, and False otherwise.
+        """
+        return self._sort_key < other._sort_key
+
+    def __le__(self, other: "Film"):
+        """
+        This method is used to check if a Film is less than or equal to (<=) another Film provided as a parameter (other). The films are compared by their sort_key, which is 
+        ordered by director (lexicographical ordering), then by release year and finally by title (lexicographical ordering).
+        
+        Parameters
+        ----------
+        other : "Film"
+            The Film being compared to the Film used to call the function, wanting to know if the latter is less than or equal to other.
+        
+        Returns
+        -------
+        boolean
+            True if Film <= other, and False otherwise.
+        """
+        return self._sort_key <= other._sort_key
+
     def __ge__(self, other: "Film"):
         """
         This method is used to check if a Film is greater than or equal to (>=) another Film provided as a parameter (other). 
         To do this, it starts by comparing the directors based on lexicographical ordering. If there is a tie, it compares by the release year. 
-        Finally, if there is another tie, it compares by the title of the Film, as it did with the director. This function returns a boolean value 
-        depending on whether the Film calling the function (self) is greater than or equal to the other Film (returning True in this case and False otherwise).
+        Finally, if there is another tie, it compares by the title of the Film, as it did with the director. These three comparisons are made at once by comparing 
+        the sort_key tuples of both Films. This function returns a boolean value depending on whether the Film calling the function (self) is greater than or equal 
+        to the other Film (returning True in this case and False otherwise).
         
         Parameters
         ----------
@@ -228,20 +336,15 @@ class Film:
         boolean
             True if Film >= other, and False otherwise.
         """
-        if self.director == other.director:
-            if self.release_year == other.release_year:
-                return self.title >= other.title
-            else:
-                return self.release_year >= other.release_year
-        else:
-            return self.director >= other.director
+        return self._sort_key >= other._sort_key
         
     def __gt__(self, other: "Film"):
         """
         This method is used to check if a Film is greater than (>) another Film provided as a parameter (other). 
         To do this, it starts by comparing the directors based on lexicographical ordering. If there is a tie, it compares by the release year. 
-        Finally, if there is another tie, it compares by the title of the Film, as it did with the director. This function returns a boolean value 
-        depending on whether the Film calling the function (self) is greater than the other Film (returning True in this case and False otherwise).
+        Finally, if there is another tie, it compares by the title of the Film, as it did with the director. These three comparisons are made at once by comparing 
+        the sort_key tuples of both Films. This function returns a boolean value depending on whether the Film calling the function (self) is greater than the other 
+        Film (returning True in this case and False otherwise).
         Parameters
         ----------
         other : "Film"
@@ -251,13 +354,7 @@ class Film:
         boolean
             True if Film > other, and False otherwise.
         """
-        if self.director == other.director:
-            if self.release_year == other.release_year:
-                return self.title > other.title
-            else:
-                return self.release_year > other.release_year
-        else:
-            return self.director > other.director
+        return self._sort_key > other._sort_key
         
     def __eq__(self, other: "Film"):
         
@@ -280,6 +377,323 @@ class Film:
         else:
             return self.director == other.director
 
+    def __hash__(self):
+        """
+        This method returns the hash of a Film, which is calculated from the same attributes used by __eq__ (the director and the title), so that two equal Films 
+        always have the same hash. This allows Films to be used as keys of a dictionary or stored in a set, which is used during the removal of duplicates.
+        
+        Returns
+        -------
+        int
+            The hash of the tuple (director, title) of the Film.
+        """
+        return hash((self.director, self.title))
+
+class CatalogStats:
+    """
+    Class that keeps running statistics of a catalog of Films, updated every time a Film enters or leaves it, so that they never need to be recalculated from the whole catalog.
+    
+    For each director and for each release year it stores the number of Films and the sum of their scores, from which the number of films per director and the mean scores 
+    are obtained. Adding, removing or replacing a Film costs O(1).
+    
+    Attributes
+    ----------
+    director_stats : dict
+        Dictionary whose keys are the directors and whose values are lists [number of films, sum of the scores].
+    year_stats : dict
+        Dictionary whose keys are the release years and whose values are lists [number of films, sum of the scores].
+    
+    Methods
+    -------
+    Public Methods:
+        add(self, film: Film) -> None:
+            Adds the Film to the statistics.
+        
+        remove(self, film: Film) -> None:
+            Removes the Film from the statistics.
+        
+        replace(self, old_film: Film, new_film: Film) -> None:
+            Replaces old_film with new_film in the statistics.
+        
+        director_frame(self) -> pandas.DataFrame:
+            Returns a DataFrame with the number of films and the mean score of each director.
+        
+        year_frame(self) -> pandas.DataFrame:
+            Returns a DataFrame with the mean score of each release year.
+    """
+
+    def __init__(self):
+        """
+        Creates empty statistics.
+
+        Returns
+        -------
+        None.
+        """
+        self._director_stats = {}
+        self._year_stats = {}
+
+    @property
+    def director_stats(self):
+        """
+        Gets the statistics of each director.
+        
+        Returns
+        -------
+        dict
+            Dictionary with the directors as keys and lists [number of films, sum of the scores] as values.
+        """
+        return self._director_stats
+
+    @property
+    def year_stats(self):
+        """
+        Gets the statistics of each release year.
+        
+        Returns
+        -------
+        dict
+            Dictionary with the release years as keys and lists [number of films, sum of the scores] as values.
+        """
+        return self._year_stats
+
+    def add(self, film: Film) -> None:
+        """
+        Adds a Film to the statistics, increasing the counter and the sum of the scores of its director and of its release year.
+        
+        Parameters
+        ----------
+        film : Film
+            The Film that enters the catalog.
+
+        Returns
+        -------
+        None
+        """
+        for stats, key in ((self.director_stats, film.director), (self.year_stats, film.release_year)):
+            entry = stats.setdefault(key, [0, 0.0])
+            entry[0] += 1
+            entry[1] += film.score
+
+    def remove(self, film: Film) -> None:
+        """
+        Removes a Film from the statistics, decreasing the counter and the sum of the scores of its director and of its release year. When a director or a year 
+        has no Films left, its entry is deleted.
+        
+        Parameters
+        ----------
+        film : Film
+            The Film that leaves the catalog.
+
+        Returns
+        -------
+        None
+        """
+        for stats, key in ((self.director_stats, film.director), (self.year_stats, film.release_year)):
+            entry = stats[key]
+            entry[0] -= 1
+            entry[1] -= film.score
+            if entry[0] == 0:
+                del stats[key]
+
+    def replace(self, old_film: Film, new_film: Film) -> None:
+        """
+        Replaces a Film of the statistics by another one (for example, when a duplicated Film is replaced by its newest version).
+        
+        Parameters
+        ----------
+        old_film : Film
+            The Film that leaves the catalog.
+        new_film : Film
+            The Film that takes its place.
+
+        Returns
+        -------
+        None
+        """
+        self.remove(old_film)
+        self.add(new_film)
+
+    def director_frame(self) -> pandas.DataFrame:
+        """
+        Returns a DataFrame, indexed (and ordered) by director, with the number of films and the mean score of each director. It is built from the running 
+        statistics, so its size is the number of directors and not the number of Films.
+        
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame with the columns ("Films", "count") and ("Score", "mean").
+        """
+        directors = sorted(self.director_stats)
+        return pandas.DataFrame({("Films", "count"): [self.director_stats[d][0] for d in directors],
+                                 ("Score", "mean"): [self.director_stats[d][1] / self.director_stats[d][0] for d in directors]},
+                                index=pandas.Index(directors, name="Director"))
+
+    def year_frame(self) -> pandas.DataFrame:
+        """
+        Returns a DataFrame, indexed (and ordered) by release year, with the mean score of the Films of each year. It is built from the running statistics, 
+        so its size is the number of years and not the number of Films.
+        
+        Returns
+        -------
+        pandas.DataFrame
+            DataFrame with the column ("Score", "mean").
+        """
+        years = sorted(self.year_stats)
+        return pandas.DataFrame({("Score", "mean"): [self.year_stats[y][1] / self.year_stats[y][0] for y in years]},
+                                index=pandas.Index(years, name="Release year"))
+
+class QueryCache:
+    """
+    Bounded cache of the results of the queries of a catalog, which discards the least recently used result when it is full (LRU).
+    
+    Each result is stored with the version of the catalog it was calculated from. A result is only returned while the catalog keeps the same version, so the 
+    catalog only needs to increase its version when it changes, and the results calculated before are discarded when they are requested again (or when they 
+    are the least recently used ones).
+    
+    Attributes
+    ----------
+    capacity : int
+        Maximum number of results stored (0 disables the cache).
+    hits : int
+        Number of queries answered from the cache.
+    misses : int
+        Number of queries that were not in the cache (or were outdated).
+    
+    Methods
+    -------
+    Public Methods:
+        get(self, key: tuple, version: int) -> list:
+            Returns the result stored for a query, if it is still valid.
+        
+        put(self, key: tuple, version: int, result: list) -> None:
+            Stores the result of a query.
+        
+        clear(self) -> None:
+            Removes all the results.
+    """
+
+    def __init__(self, capacity: int = 128):
+        """
+        Creates an empty cache.
+        
+        Parameters
+        ----------
+        capacity : int
+            Maximum number of results stored (128 by default, 0 disables the cache).
+
+        Returns
+        -------
+        None.
+        """
+        self._capacity = capacity
+        self._results = OrderedDict()      # key -> (version, result), from the least to the most recently used
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def capacity(self):
+        """
+        Gets the maximum number of results stored.
+        
+        Returns
+        -------
+        int
+            The capacity of the cache.
+        """
+        return self._capacity
+
+    @property
+    def hits(self):
+        """
+        Gets the number of queries answered from the cache.
+        
+        Returns
+        -------
+        int
+            The number of hits.
+        """
+        return self._hits
+
+    @property
+    def misses(self):
+        """
+        Gets the number of queries that were not answered from the cache.
+        
+        Returns
+        -------
+        int
+            The number of misses.
+        """
+        return self._misses
+
+    def __len__(self):
+        """
+        Returns the number of results stored.
+        """
+        return len(self._results)
+
+    def get(self, key: tuple, version: int) -> list:
+        """
+        Returns the result stored for a query if it was calculated from the given version of the catalog, marking it as the most recently used one. An outdated
+        result is removed.
+        
+        Parameters
+        ----------
+        key : tuple
+            The type of the query and its arguments.
+        version : int
+            The current version of the catalog.
+
+        Returns
+        -------
+        list
+            The result of the query, or None if it is not in the cache.
+        """
+        entry = self._results.get(key)
+        if entry is not None and entry[0] == version:
+            self._results.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+        if entry is not None:
+            del self._results[key]
+        self._misses += 1
+        return None
+
+    def put(self, key: tuple, version: int, result: list) -> None:
+        """
+        Stores the result of a query as the most recently used one, discarding the least recently used result if the cache is full.
+        
+        Parameters
+        ----------
+        key : tuple
+            The type of the query and its arguments.
+        version : int
+            The version of the catalog the result was calculated from.
+        result : list
+            The result of the query.
+
+        Returns
+        -------
+        None
+        """
+        if self.capacity <= 0:
+            return
+        self._results[key] = (version, result)
+        self._results.move_to_end(key)
+        if len(self._results) > self.capacity:
+            self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Removes all the results stored (the counters are kept).
+
+        Returns
+        -------
+        None
+        """
+        self._results.clear()
+
 class Film_Manager:
     """
     Class responsible for managing Films to use their information.
@@ -293,19 +707,39 @@ class Film_Manager:
     through which the user can make personalized queries within the catalog.
     
     Usage Example:
-        manager = Film_Manager()
+        manager = Film_Manager()      # or Film_Manager(ArrayOrderedPositionalList), Film_Manager(SkipOrderedPositionalList), Film_Manager(columnar=True),
+                                      # Film_Manager(columnar=True, table_class=FilmFrame)
         manager.user_menu()
         
     Attributes
     ----------
     Class Attributes: 
         
-        film_list: LinkedOrderedPositionalList or ArrayOrderedPositionalList
+        film_list: LinkedOrderedPositionalList, ArrayOrderedPositionalList, SkipOrderedPositionalList, or FilmTable or FilmFrame (in columnar mode)
             Ordered list containing a series of movies, Film objects, that will be handled by it and used in a catalog.
-        film_unique_list: LinkedOrderedPositionalList or ArrayOrderedPositionalList
+        film_unique_list: LinkedOrderedPositionalList, ArrayOrderedPositionalList, SkipOrderedPositionalList, or FilmTable or FilmFrame (in columnar mode)
             Ordered list that becomes an ordered list without duplicates through the _delete_duplicated function.
+        director_index: dict
+            Dictionary whose keys are the directors and whose values are lists with the Films of film_list directed by them (ordered as in film_list).
+        year_index: dict
+            Dictionary whose keys are the release years and whose values are lists with the Films of film_list released that year (ordered as in film_list).
+        stats: CatalogStats
+            Running statistics (number of films and scores per director and per release year) of film_unique_list, updated every time a Film is added to it or replaced
+            (with FilmFrames, film_unique_list itself).
+        director_search: TrigramIndex
+            Trigram index of the directors of film_list, used for approximate searches.
+        title_search: TrigramIndex
+            Trigram index of the titles of film_list, used for approximate searches (built the first time it is used, as it is much larger than the index
+            of the directors).
+        version: int
+            Version of the catalog, increased every time film_list or film_unique_list change.
+        query_cache: QueryCache
+            LRU cache with the results of the queries (by director, year, range, prefix, window of years and top), valid while the version does not change.
             
-    Both implementations (array_ordered_positional_list and linked_ordered_positional_list) can be used for both lists, obtaining equivalent results. 
+    The three implementations (array_ordered_positional_list, linked_ordered_positional_list and skip_ordered_positional_list) can be used for both lists, obtaining equivalent results. 
+    In columnar mode, both lists are replaced by FilmTables (film_table), which store the catalog in typed arrays and only create the Films that are returned, 
+    so large catalogs take much less memory, or by FilmFrames (film_frame), which load, sort and deduplicate the catalog with vectorized pandas operations. The 
+    catalog is read-only in this mode (deltas cannot be applied), and with FilmFrames stats is the frame without duplicates itself, which calculates its statistics with pandas.
     
     Methods
     -------
@@ -319,22 +753,101 @@ class Film_Manager:
                 5) Create a file with the movies containing no duplicates 
                 6) Show stats of the catalog 
             from option 2 to 4, the ordered list WITH duplicates is used, in 5 and 6 the list WITHOUT DUPLICATES is used. 
+            
+        films_by_director(self, director: str) -> list:
+            Returns the Films of film_list directed by the given director, using the director index.
+            
+        films_by_year(self, year: int) -> list:
+            Returns the Films of film_list released in the given year, using the release year index.
+            
+        films_by_director_range(self, first: str, last: str) -> list:
+            Returns the Films of film_list whose director is in the lexicographical range [first, last].
+            
+        films_by_director_prefix(self, prefix: str) -> list:
+            Returns the Films of film_list whose director starts with the given prefix.
+            
+        films_by_director_years(self, director: str, first_year: int, last_year: int) -> list:
+            Returns the Films of a director released in the window of years [first_year, last_year].
+            
+        similar_directors(self, name: str, limit: int) -> list:
+            Returns the directors of the catalog most similar to the given name (typo tolerant search).
+            
+        similar_titles(self, title: str, limit: int) -> list:
+            Returns the titles of the catalog most similar to the given one (typo tolerant search).
+            
+        top_films(self, n: int, director: str, year: int) -> list:
+            Returns the n Films without duplicates with the highest score (of the whole catalog, of a director or of a year).
+            
+        apply_delta(self, delta_file: str) -> tuple:
+            Applies a file of added and retracted movies to the loaded catalog, updating film_unique_list only for the affected movies.
+            
+        run_batch(self, queries_file: str, output: str) -> tuple:
+            Runs all the queries of a file (without the interactive menu) and writes their results and latencies to an output file.
+            
+        merge_catalogs(self, film_catalogs: list, output: str, presorted: bool, compress: bool) -> int:
+            Merges several catalog files into one ordered file without duplicates, streaming the movies (the catalogs are not loaded in the manager).
 
     Private Methods: 
-        _create_film(self, films_text:str )-> list:
+        _add_film(self, film: Film) -> None:
+            Adds a Film to film_list and updates the director and release year indexes.
+            
+        _add_films(self, films: list) -> None:
+            Adds a batch of Films to film_list (sorting it only once) and updates the director and release year indexes.
+            
+        _index_film(self, index: dict, key, film: Film) -> None:
+            Inserts a Film in an entry of a secondary index, keeping it ordered.
+            
+        _unindex_film(self, index: dict, key, film: Film) -> None:
+            Removes a Film from an entry of a secondary index.
+            
+        _remove_films(self, films: list) -> None:
+            Removes a batch of Films from film_list (all at once) and from the secondary indexes.
+            
+        _find_film(self, film: Film) -> Film:
+            Looks for a stored Film equal in all its attributes to the given one.
+            
+        _newest_version(self, director: str, title: str) -> Film:
+            Returns the version of a movie (the newest one) that film_unique_list must contain.
+            
+        _director_films(self, director: str) -> list:
+            Returns the Films of a director without going through the query cache.
+            
+        _read_films(self, film_catalog: str):
+            Generator that reads the catalog file line by line, yielding a Film for each movie.
+            
+        _read_films_parallel(self, film_catalog: str):
+            Reads the catalog file in parallel with a pool of processes, returning its Films ordered.
+            
+        _sorted_run(self, film_catalog: str, presorted: bool):
+            Generator that yields the Films of a catalog file in order, sorting it if it is not already sorted.
+            
+        _create_film(self, film_catalog: str)-> None:
             This function creates Film objects from a given text document with the necessary information and is responsible for adding the read movies to the list
-            film_list, an ordered list of the movies in its catalog. Returns a list with the data of the unique movies, used subsequently
-            for statistical purposes.
+            film_list, an ordered list of the movies in its catalog. Then it removes the duplicates calling _delete_duplicated().
+            
+        _create_table(self, film_catalog: str) -> None:
+            Loads a catalog in columnar mode, building the FilmTables (or FilmFrames) of the catalog and of the movies without duplicates.
             
-        _delete_duplicated(self) -> list :
-            Removes duplicated movies from the ordered list film_unique_list. Returns a list with the data of the unique movies, which is passed to the _create_film function used subsequently
-            for statistical purposes.
+        _load_cached(self, films: list, unique_films: list) -> None:
+            Fills the empty manager with the Films read from the sidecar file of a catalog.
             
-        _file_writer(self) -> None:
-            Writes in a new file ("unique_films_file.txt") the ordered movies, without duplicates.
+        _delete_duplicated(self) -> None :
+            Removes duplicated movies from the ordered list film_unique_list, updating the running statistics (stats) of the catalog.
+            
+        _run_query(self, query: str) -> list:
+            Runs a single query of a batch, returning the Films found.
+            
+        _cached_query(self, key: tuple, query) -> list:
+            Returns the result of a query from the query cache, calculating it only if it is not there.
+            
+        _new_version(self) -> None:
+            Increases the version of the catalog, so the cached results are no longer used.
+            
+        _file_writer(self, output: str, compress: bool) -> int:
+            Writes in a new file ("unique_films_file.txt" by default, optionally compressed with gzip) the ordered movies, without duplicates.
         
-        _pandas_stats(self, data_film_list: list) -> None:
-            Calculates and prints statistics based on the movie data (WITHOUT DUPLICATES) in the catalog: number of movies per director, average score per director, and average score per
+        _pandas_stats(self) -> None:
+            Prints statistics based on the movie data (WITHOUT DUPLICATES) in the catalog: number of movies per director, average score per director, and average score per
             release year.
         
     Note
@@ -342,23 +855,73 @@ class Film_Manager:
     To start the program execution, only the user_menu method needs to be called, the other methods are called internally. 
     """
 
-    def __init__(self):
+    def __init__(self, list_class=LinkedOrderedPositionalList, processes: int = 1, use_cache: bool = True, columnar: bool = False, cache_size: int = 128, table_class=FilmTable):
         """
         Defines the class attributes, which are the two lists to be used in the implementation.
         
+        Parameters
+        ----------
+        list_class : class
+            The implementation of the ordered positional list used for both lists: LinkedOrderedPositionalList (by default), ArrayOrderedPositionalList, 
+            which finds the place of each new Film by binary search, or SkipOrderedPositionalList, which finds it in expected O(log n) without moving the 
+            rest of the Films (the best option for large catalogs).
+        processes : int
+            Number of processes used to read a catalog (1 by default, which reads it sequentially). With more than one, the catalog is parsed in parallel by a pool of processes.
+        use_cache : bool
+            Whether the sidecar files with the parsed catalogs are used and written (True by default).
+        columnar : bool
+            Whether the catalog is stored in columns, in FilmTables or FilmFrames, instead of in the ordered lists and the indexes (False by default). The sidecar 
+            files and the processes are not used in this mode.
+        cache_size : int
+            Maximum number of query results kept in the query cache (128 by default, 0 disables it).
+        table_class : class
+            The implementation of the catalog used in columnar mode: FilmTable (by default), which keeps the movies in typed arrays, or FilmFrame, which keeps 
+            them in a pandas DataFrame.
+        
         Class Attributes: 
         -----------------
-            film_list: LinkedOrderedPositionalList or ArrayOrderedPositionalList
+            film_list: LinkedOrderedPositionalList, ArrayOrderedPositionalList, SkipOrderedPositionalList, or FilmTable or FilmFrame (in columnar mode)
                 An ordered list containing a series of movies, Film objects, that will be handled by the class and used in a catalog.
-            film_unique_list: LinkedOrderedPositionalList or ArrayOrderedPositionalList
+            film_unique_list: LinkedOrderedPositionalList, ArrayOrderedPositionalList, SkipOrderedPositionalList, or FilmTable or FilmFrame (in columnar mode)
                 An ordered list that starts being empty and through the _delete_duplicated function, becomes an ordered list without duplicates.
+            director_index: dict
+                Secondary index of film_list by director (starts as empty).
+            year_index: dict
+                Secondary index of film_list by release year (starts as empty).
+            directors: list
+                The keys of director_index in lexicographical order, rebuilt when it is needed after new directors are added (None means it has to be rebuilt).
+            stats: CatalogStats
+                Running statistics of film_unique_list (starts as empty).
+            director_search: TrigramIndex
+                Trigram index of the directors of film_list (starts as empty).
+            title_search: TrigramIndex
+                Trigram index of the titles of film_list (None until it is used for the first time).
+            version: int
+                Version of the catalog (starts as 0).
+            query_cache: QueryCache
+                LRU cache of the results of the queries (starts as empty).
+            catalogs: list
+                Names of the catalogs loaded in columnar mode (the tables are built again from all of them when a new one is loaded).
     
         Returns
         -------
         None.
         """
-        self._film_list = LinkedOrderedPositionalList() #Or ArrayOrderedPositionalList()
-        self._film_unique_list = LinkedOrderedPositionalList() #Or ArrayOrderedPositionalList()
+        self._film_list = list_class()
+        self._film_unique_list = list_class()
+        self._director_index = {}
+        self._year_index = {}
+        self._directors = []
+        self._stats = CatalogStats()
+        self._director_search = TrigramIndex()
+        self._title_search = None
+        self._version = 0
+        self._query_cache = QueryCache(cache_size)
+        self._processes = processes
+        self._use_cache = use_cache
+        self._columnar = columnar
+        self._table_class = table_class
+        self._catalogs = []
         
     @property
     def film_list(self):
@@ -367,7 +930,7 @@ class Film_Manager:
         
         Returns
         -------
-        LinkedOrderedPositionalList() #or ArrayOrderedPositionalList(): 
+        LinkedOrderedPositionalList() #or ArrayOrderedPositionalList() or SkipOrderedPositionalList(): 
             The Film ordered list of the catalog.
         """
         return self._film_list
@@ -379,50 +942,667 @@ class Film_Manager:
         
         Returns
         -------
-        LinkedOrderedPositionalList() #or ArrayOrderedPositionalList(): 
+        LinkedOrderedPositionalList() #or ArrayOrderedPositionalList() or SkipOrderedPositionalList(): 
             The Film ordered list of the catalog without duplicates.
             
         """
         return self._film_unique_list
     
-
- 
-    def _create_film(self, films_text:str )-> list:
+    @property
+    def director_index(self):
         """
-        This function creates Film objects from a given text document with the necessary information and is responsible for adding the read movies to the list film_list. 
-        Returns a list with the data of the movies, used subsequently for statistical purposes.
+        Gets the index of film_list by director.
         
-        Method Characteristics:
-            - Instances of the Film class are created using the attributes provided in the films_text.
-            - These instances are added to film_list.
-            - film_unique_list starts being empty, but then the _delete_duplicated() method is called to remove duplicate movies from it.
-    
-        Parameters
+        Returns
+        -------
+        dict
+            Dictionary with the directors as keys and the lists of their Films (in the order of film_list) as values.
+        """
+        return self._director_index
+
+    @property
+    def year_index(self):
+        """
+        Gets the index of film_list by release year.
+        
+        Returns
+        -------
+        dict
+            Dictionary with the release years as keys and the lists of the Films released that year (in the order of film_list) as values.
+        """
+        return self._year_index
+
+    @property
+    def director_search(self):
+        """
+        Gets the trigram index of the directors.
+        
+        Returns
+        -------
+        TrigramIndex
+            The index of the directors of film_list.
+        """
+        return self._director_search
+
+    @property
+    def title_search(self):
+        """
+        Gets the trigram index of the titles. It is only built the first time it is needed (from the titles of film_list, without materializing the Films in 
+        columnar mode), so a catalog that is never searched by approximate title does not pay its memory; after that, it is kept up to date with film_list.
+        
+        Returns
+        -------
+        TrigramIndex
+            The index of the titles of film_list (each title is counted once for every Film with it).
+        """
+        if self._title_search is None:
+            self._title_search = TrigramIndex()
+            titles = self.film_list.titles() if self.columnar else (film.title for film in self.film_list)
+            for title in titles:
+                self._title_search.add(title)
+        return self._title_search
+
+    @property
+    def version(self):
+        """
+        Gets the version of the catalog, which is increased every time it changes.
+        
+        Returns
+        -------
+        int
+            The version of the catalog.
+        """
+        return self._version
+
+    @property
+    def query_cache(self):
+        """
+        Gets the cache of the results of the queries, with its hit and miss counters.
+        
+        Returns
+        -------
+        QueryCache
+            The query cache.
+        """
+        return self._query_cache
+
+    def _new_version(self) -> None:
+        """
+        Increases the version of the catalog. It must be called every time film_list or film_unique_list change, so the results stored in the query cache, 
+        which were calculated from the previous version, are not returned anymore.
+
+        Returns
+        -------
+        None
+        """
+        self._version += 1
+
+    def _cached_query(self, key: tuple, query) -> list:
+        """
+        Returns the result of a query from the query cache or, if it is not there (or it was calculated from an older version of the catalog), calculates it and 
+        stores it. A copy of the result is returned, so the caller can modify it without changing the cache.
+        
+        Parameters
         ----------
-        films_text : str
-            Text with the information of the movies.
-            Each movie in the films_text must be on a separate line, and each of its attributes separated by a semicolon (;).
-    
+        key : tuple
+            The type of the query and its arguments.
+        query : function
+            Function without arguments that calculates the result.
+
         Returns
         -------
         list
-            A list with the movies from the catalog ordered and without duplicates, using this list the statistics will be calculated. 
-            This list is created and returned by the _delete_duplicated() method.
+            The result of the query.
+        """
+        result = self.query_cache.get(key, self.version)
+        if result is None:
+            result = query()
+            self.query_cache.put(key, self.version, result)
+        return list(result)
+
+    @property
+    def processes(self):
+        """
+        Gets the number of processes used to read a catalog.
+        
+        Returns
+        -------
+        int
+            Number of processes (1 means that the catalog is read sequentially).
+        """
+        return self._processes
+
+    @property
+    def use_cache(self):
+        """
+        Gets whether the sidecar files with the parsed catalogs are used.
+        
+        Returns
+        -------
+        bool
+            True if the sidecar files are read and written, False otherwise.
+        """
+        return self._use_cache
+
+    @property
+    def columnar(self):
+        """
+        Gets whether the catalog is stored in columns (FilmTables).
+        
+        Returns
+        -------
+        bool
+            True in columnar mode.
+        """
+        return self._columnar
+
+    @property
+    def stats(self):
+        """
+        Gets the running statistics of the catalog without duplicates.
+        
+        Returns
+        -------
+        CatalogStats
+            The statistics of film_unique_list.
+        """
+        return self._stats
+
+    def _add_film(self, film: Film) -> None:
+        """
+        Adds a Film to the ordered list film_list and updates the secondary indexes (director_index and year_index) and the trigram indexes, so that they always contain the same Films as film_list.
+        Inside each entry of the indexes the Films are kept in the same order as in film_list: the Films of a director are ordered by release year and title, and the Films of
+        a year by director and title. To do this, the Film is inserted with insort (binary search) using its sort_key.
+        
+        Parameters
+        ----------
+        film : Film
+            The Film to be added to the catalog.
+
+        Returns
+        -------
+        None
+        """
+        self._new_version()
+        self.film_list.add(film)
+        if film.director not in self.director_index:
+            self._directors = None
+            self.director_search.add(film.director)
+        if self._title_search is not None:
+            self._title_search.add(film.title)
+        self._index_film(self.director_index, film.director, film)
+        self._index_film(self.year_index, film.release_year, film)
+
+    def _index_film(self, index: dict, key, film: Film) -> None:
+        """
+        Inserts a Film in the entry of a secondary index with the given key, keeping the entry ordered. As the catalogs are loaded in order, the Film usually goes
+        at the end of the entry, so it is only inserted with insort (binary search) when it is less than the last Film of the entry.
+        
+        Parameters
+        ----------
+        index : dict
+            The secondary index (director_index or year_index).
+        key : str or int
+            The key of the entry (the director or the release year of the Film).
+        film : Film
+            The Film to be indexed.
+
+        Returns
+        -------
+        None
+        """
+        entry = index.setdefault(key, [])
+        if entry and film < entry[-1]:
+            insort(entry, film, key=attrgetter("sort_key"))
+        else:
+            entry.append(film)
+
+    def _add_films(self, films: list) -> None:
+        """
+        Adds a whole batch of Films (in any order) to the ordered list film_list and updates the secondary indexes. Adding the Films one by one with _add_film() 
+        makes the ordered list walk its elements on every insertion (O(n^2) for a catalog), so instead the batch is sorted only once here and passed, as presorted, 
+        to the add_all() method of the ordered list, which links it into the list without sorting it again, in O(n log n) overall. The sorting uses the precomputed 
+        sort_key of the Films, so the comparisons are tuple comparisons. The Films are inserted in the indexes in that same order, so in most cases they are only 
+        appended at the end of their entry.
+        
+        Parameters
+        ----------
+        films : list
+            List (or any iterable, like the _read_films() generator) of Films to be added to the catalog.
+
+        Returns
+        -------
+        None
+        """
+        self._new_version()
+        sort_key = attrgetter("sort_key")
+        films = sorted(films, key=sort_key)
+        self.film_list.add_all(films, key=sort_key, presorted=True)
+        for film in films:
+            if film.director not in self.director_index:
+                self._directors = None
+                self.director_search.add(film.director)
+            if self._title_search is not None:
+                self._title_search.add(film.title)
+            self._index_film(self.director_index, film.director, film)
+            self._index_film(self.year_index, film.release_year, film)
+
+    def _unindex_film(self, index: dict, key, film: Film) -> None:
+        """
+        Removes a Film (the same object, not an equal one) from the entry of a secondary index with the given key. The Film is found by binary search with its sort_key,
+        and the entry is removed from the index when it becomes empty.
+        
+        Parameters
+        ----------
+        index : dict
+            The secondary index (director_index or year_index).
+        key : str or int
+            The key of the entry (the director or the release year of the Film).
+        film : Film
+            The Film to be removed.
+
+        Returns
+        -------
+        None
+        """
+        entry = index[key]
+        i = bisect_left(entry, film.sort_key, key=attrgetter("sort_key"))
+        while entry[i] is not film:    # Films with the same sort_key
+            i += 1
+        del entry[i]
+        if not entry:
+            del index[key]
+
+    def _remove_films(self, films: list) -> None:
+        """
+        Removes a batch of Films of the catalog from the ordered list film_list, from the secondary indexes and from the trigram indexes (the inverse of _add_films()).
+        Their positions are looked for all at once with find_all() (a single walk of the linked list, a search per Film in the other lists) and they are deleted all 
+        at once with delete_all() (the array list is rebuilt only one time), so the ordered list is not walked for every Film.
+        
+        Parameters
+        ----------
+        films : list
+            The Films to be removed (objects stored in film_list, all different).
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            If a Film is not in film_list (nothing is removed then).
+        """
+        positions = self.film_list.find_all(films)
+        if None in positions:
+            raise ValueError(f"The catalog does not contain: {films[positions.index(None)]}")
+        self._new_version()
+        self.film_list.delete_all(positions)
+        for film in films:
+            self._unindex_film(self.director_index, film.director, film)
+            self._unindex_film(self.year_index, film.release_year, film)
+            if self._title_search is not None:
+                self._title_search.remove(film.title)
+            if film.director not in self.director_index:
+                self._directors = None
+                self.director_search.remove(film.director)
+
+    def _find_film(self, film: Film, excluded: set = frozenset()) -> Film:
+        """
+        Looks for a Film of the catalog with the same director, title, release year and score as the given one, using the director index.
+        
+        Parameters
+        ----------
+        film : Film
+            The Film to look for.
+        excluded : set
+            The ids (id()) of the stored Films that must be skipped, for example because they have already been found for another equal Film.
+
+        Returns
+        -------
+        Film
+            The Film stored in film_list (the first one not excluded if there are several), or None if there is no such Film in the catalog.
+        """
+        entry = self.director_index.get(film.director, [])
+        i = bisect_left(entry, film.sort_key, key=attrgetter("sort_key"))
+        while i < len(entry) and entry[i].sort_key == film.sort_key:
+            if entry[i].score == film.score and id(entry[i]) not in excluded:
+                return entry[i]
+            i += 1
+        return None
+
+    def _newest_version(self, director: str, title: str) -> Film:
+        """
+        Returns the version of a movie that film_unique_list must contain: among the Films of film_list with the given director and title, the one with the newest 
+        release year (the first one if there are several with that year), as _delete_duplicated() does. Only the Films of the director are visited.
+        
+        Parameters
+        ----------
+        director : str
+            The director of the movie.
+        title : str
+            The title of the movie.
+
+        Returns
+        -------
+        Film
+            The version to keep, or None if there is no Film with that director and title.
+        """
+        newest = None
+        for film in self.director_index.get(director, []):
+            if film.title == title and (newest is None or newest.release_year < film.release_year):
+                newest = film
+        return newest
+
+    def films_by_director(self, director: str) -> list:
+        """
+        Returns the Films of the catalog (film_list) directed by the given director. Instead of traversing the whole film_list, the director index is used, so the cost
+        only depends on the number of Films returned.
+        
+        Parameters
+        ----------
+        director : str
+            The name of the director (last name, first name).
+
+        Returns
+        -------
+        list
+            The Films of the director, ordered by release year and title (empty if the director is not in the catalog).
+        """
+        def query():
+            if self.columnar:
+                return self.film_list.films_by_director(director)
+            return list(self.director_index.get(director, []))
+        return self._cached_query(("director", director), query)
+
+    def _director_films(self, director: str) -> list:
+        """
+        Returns the Films of a director without going through the query cache, for the queries that only need them to calculate their own (cached) result. In list 
+        mode the entry of the director index itself is returned, without copying it, so it must not be modified.
+        
+        Parameters
+        ----------
+        director : str
+            The name of the director (last name, first name).
+
+        Returns
+        -------
+        list
+            The Films of the director, ordered by release year and title.
+        """
+        if self.columnar:
+            return self.film_list.films_by_director(director)
+        return self.director_index.get(director, [])
+
+    def films_by_year(self, year: int) -> list:
+        """
+        Returns the Films of the catalog (film_list) released in the given year. Instead of traversing the whole film_list, the release year index is used, so the cost
+        only depends on the number of Films returned.
+        
+        Parameters
+        ----------
+        year : int
+            The release year.
+
+        Returns
+        -------
+        list
+            The Films released that year, ordered by director and title (empty if no Film of the catalog was released that year).
+        """
+        def query():
+            if self.columnar:
+                return self.film_list.films_by_year(year)
+            return list(self.year_index.get(year, []))
+        return self._cached_query(("year", year), query)
+
+    @property
+    def directors(self):
+        """
+        Gets the directors of the catalog in lexicographical order. The list is only sorted again when new directors have been added since the last time it was used.
+        
+        Returns
+        -------
+        list
+            The directors of film_list, ordered.
+        """
+        if self._directors is None:
+            self._directors = sorted(self.director_index)
+        return self._directors
+
+    def films_by_director_range(self, first: str, last: str) -> list:
+        """
+        Returns the Films of the catalog (film_list) whose director is between first and last (both included, in lexicographical order). The first and the last
+        directors of the range are found by binary search in the ordered list of directors, and then only the Films of the directors of the range are visited.
+        
+        Parameters
+        ----------
+        first : str
+            The first director of the range (it does not need to be in the catalog).
+        last : str
+            The last director of the range (it does not need to be in the catalog).
+
+        Returns
+        -------
+        list
+            The Films of the directors of the range, in the order of film_list.
+        """
+        def query():
+            if self.columnar:
+                return self.film_list.films_by_director_range(first, last)
+            directors = self.directors
+            films = []
+            for director in directors[bisect_left(directors, first):bisect_right(directors, last)]:
+                films.extend(self.director_index[director])
+            return films
+        return self._cached_query(("range", first, last), query)
+
+    def films_by_director_prefix(self, prefix: str) -> list:
+        """
+        Returns the Films of the catalog (film_list) whose director starts with the given prefix (for example, the beginning of the last name). The directors with
+        that prefix are consecutive in the ordered list of directors, so the first one is found by binary search and the list is walked until a director does not 
+        start with the prefix.
+        
+        Parameters
+        ----------
+        prefix : str
+            The beginning of the name of the director (last name, first name).
+
+        Returns
+        -------
+        list
+            The Films of the directors with that prefix, in the order of film_list.
+        """
+        def query():
+            if self.columnar:
+                return self.film_list.films_by_director_prefix(prefix)
+            directors = self.directors
+            films = []
+            k = bisect_left(directors, prefix)
+            while k < len(directors) and directors[k].startswith(prefix):
+                films.extend(self.director_index[directors[k]])
+                k += 1
+            return films
+        return self._cached_query(("prefix", prefix), query)
+
+    def films_by_director_years(self, director: str, first_year: int, last_year: int) -> list:
+        """
+        Returns the Films of a director released between first_year and last_year (both included). The Films of the director are ordered by release year in the 
+        director index, so the limits of the window are found by binary search.
+        
+        Parameters
+        ----------
+        director : str
+            The name of the director (last name, first name).
+        first_year : int
+            The first release year of the window.
+        last_year : int
+            The last release year of the window.
+
+        Returns
+        -------
+        list
+            The Films of the director in the window, ordered by release year and title.
+        """
+        def query():
+            director_films = self._director_films(director)
+            sort_key = attrgetter("sort_key")
+            # (director, year) is less than any sort_key (director, year, title)
+            start = bisect_left(director_films, (director, first_year), key=sort_key)
+            end = bisect_left(director_films, (director, last_year + 1), key=sort_key)
+            return director_films[start:end]
+        return self._cached_query(("years", director, first_year, last_year), query)
+
+ 
+    def _read_films(self, film_catalog: str):
+        """
+        Generator that reads the file with the catalog of movies and yields a Film for each of its lines. The file is not read as a whole: it is traversed line by line
+        (the file object reads it in buffered blocks), so the text of the catalog is never fully stored in memory, only the Films that are created from it. Empty lines
+        (like the ones at the end of the file) are ignored and, with strip(), we ensure that there are no additional spaces, tabs, or newline characters in each line.
+        
+        Parameters
+        ----------
+        film_catalog : str
+            Name of the file with the catalog. Each movie must be on a separate line, and each of its attributes separated by a semicolon and a space ("; "):
+            director; title; release year; score
+            
+        Yields
+        ------
+        Film
+            The Film of each line of the catalog, in the order of the file.
+        """
+        with open(film_catalog, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield Film.from_line(line)
+ 
+    def _read_films_parallel(self, film_catalog: str):
+        """
+        Reads the catalog file using a pool of processes (as many as the processes attribute of the manager). The file is split at line boundaries in byte ranges of similar 
+        size (_split_catalog()), each process parses and sorts the movies of one range (_parse_catalog_range()) and the already sorted partial results are merged with 
+        heapq.merge, so the Films are returned in the order of the catalog. The processes send back plain tuples instead of Films, because unpickling them is several 
+        times cheaper, and the Films are only created while the merged rows are consumed.
+        
+        Parameters
+        ----------
+        film_catalog : str
+            Name of the file with the catalog (same format as in _read_films()).
+            
+        Returns
+        ------
+        iterator
+            Iterator over the Films of the catalog ordered by their sort_key.
+        """
+        ranges = _split_catalog(film_catalog, self.processes)
+        with ProcessPoolExecutor(max_workers=self.processes) as pool:
+            parts = list(pool.map(_parse_catalog_range, [film_catalog] * len(ranges), *zip(*ranges)))
+        return (Film(*row) for row in merge(*parts, key=ROW_KEY))
+
+    def _create_film(self, film_catalog: str)-> None:
+        """
+        This function creates Film objects from a given text document with the necessary information and is responsible for adding the read movies to the list film_list. 
+        Then, the duplicates are removed, which also updates the statistics of the catalog.
+        
+        Method Characteristics:
+            - Instances of the Film class are created lazily by the _read_films() generator, which reads the catalog line by line, or, if the manager uses more than one 
+              process, by _read_films_parallel(), which parses parts of the file in parallel.
+            - These instances are added to film_list all at once with _add_films(), which sorts the whole catalog only once instead of inserting the movies one by one.
+            - film_unique_list starts being empty, but then the _delete_duplicated() method is called to remove duplicate movies from it.
+            - If the manager is empty, a sidecar file (catalog name + ".cache") is written with the sorted movies and the movies without duplicates. The next time the same
+              catalog is loaded (unchanged: same size and modification time or same content), the movies are read from the sidecar and the steps above are skipped.
+    
+        Parameters
+        ----------
+        film_catalog : str
+            Name of the file with the information of the movies.
+            Each movie in the file must be on a separate line, and each of its attributes separated by a semicolon (;).
+    
+        Returns
+        -------
+        None
             
         Note
         -----
         Called by the user_menu function for the proper execution of option 1.
         """
-        films = films_text.split("\n")
+        if self.columnar:
+            self._create_table(film_catalog)
+            return
+        # The sidecar file holds a single catalog, so it can only be used (and written) when the manager is empty
+        fresh_load = self.film_list.is_empty()
+        if fresh_load and self.use_cache:
+            cached = read_cache(film_catalog, Film)
+            if cached is not None:
+                self._load_cached(*cached)
+                return
         
-        for line in films:
-            film_info = line.split('; ')
-            director, title, release_year, score = film_info
-            film = Film(director, title, int(release_year), float(score))
-            self.film_list.add(film)
+        if self.processes > 1:
+            self._add_films(self._read_films_parallel(film_catalog))
+        else:
+            self._add_films(self._read_films(film_catalog))
 
-        data_film_list = self._delete_duplicated()
-        return(data_film_list)
+        self._delete_duplicated()
+        if fresh_load and self.use_cache:
+            try:
+                write_cache(film_catalog, list(self.film_list), list(self.film_unique_list))
+            except OSError:
+                # The catalog is loaded anyway, it will just be parsed again next time
+                pass
+
+    def _create_table(self, film_catalog: str) -> None:
+        """
+        Loads a catalog in columnar mode. The movies are read into a FilmTable or a FilmFrame (together with the catalogs loaded before, as the table cannot grow), 
+        which becomes film_list, and the table of the movies without duplicates becomes film_unique_list. A FilmFrame without duplicates also replaces the running 
+        statistics, as it calculates the same DataFrames with a groupby of its columns; for a FilmTable, the running statistics are built once from its Films, so 
+        printing them does not copy the whole table into a DataFrame every time. The trigram index of the directors is built again from the distinct directors 
+        of the table, and the one of the titles will be built again from its titles when it is needed.
+        
+        Parameters
+        ----------
+        film_catalog : str
+            Name of the file with the information of the movies.
+    
+        Returns
+        -------
+        None
+        """
+        table = self._table_class.from_catalogs(self._catalogs + [film_catalog], Film)
+        self._new_version()
+        self._catalogs.append(film_catalog)
+        self._film_list = table
+        self._film_unique_list = table.unique()
+        if isinstance(self._film_unique_list, FilmFrame):
+            self._stats = self._film_unique_list
+        else:
+            self._stats = CatalogStats()
+            for film in self._film_unique_list:
+                self.stats.add(film)
+        self._director_search = TrigramIndex()
+        for director in table.directors():
+            self.director_search.add(director)
+        self._title_search = None
+
+    def _load_cached(self, films: list, unique_films: list) -> None:
+        """
+        Fills the empty manager with the content of the sidecar file of a catalog (read with read_cache()): the Films of the catalog, which are already sorted, 
+        and the Films without duplicates. No parsing, sorting (the Films without duplicates are passed to add_all() as presorted) or removal of duplicates is needed.
+        
+        Parameters
+        ----------
+        films : list
+            The Films of the catalog, sorted.
+        unique_films : list
+            The Films of the catalog without duplicates, sorted.
+
+        Returns
+        -------
+        None
+        """
+        self._add_films(films)
+        self._new_version()
+        self.film_unique_list.add_all(unique_films, key=attrgetter("sort_key"), presorted=True)
+        for film in unique_films:
+            self.stats.add(film)
     
     def user_menu(self) -> None:
         """
@@ -437,13 +1617,15 @@ class Film_Manager:
         The menu will continuously appear until a character other than (1,2,3,4,5,6) is entered. If another number is entered, the while loop will exit, and if it's another character, an exception is handled 
         because the user input is converted to an integer, in these cases the function ends and "Exiting..." is printed. To choose an option different than 1, a warning will appear: it is necessary to enter 
         data in order to work with them, and until data is entered or the menu is exited, it will continue appearing. When option 1 is selected (necessary to start), the catalog of movies will be created using 
-        the filename entered by the user, this file will be opened and the create_film() function will be called to fill the film_list attribute of the Film_Manager and return the data_film_list with information 
-        about them, used in option 6. If it is not possible to access the file or the file does not exist, it goes from the previous try part to the exception, indicating that the file must be valid in the directory.
-        From this point on, we can use the other options. Options 2, 3, and 4 iterate through film_list, the first printing all the movies in the catalog. Option 3 asks for a last name and first name of the author to 
-        search for them in the catalog and return the movies that correspond to them (none if the author is not found in the catalog or the format is not valid), it also checks that they are valid characters. Option 4 asks 
+        the filename entered by the user, the create_film() function will be called (which reads this file line by line) to fill the film_list attribute of the Film_Manager and the list without duplicates 
+        (and its statistics, used in option 6). If it is not possible to access the file or the file does not exist, it goes from the previous try part to the exception, indicating that the file must be valid in the directory.
+        From this point on, we can use the other options. Option 2 iterates through film_list printing all the movies in the catalog, while options 3 and 4 use the director and release year indexes 
+        (films_by_director() and films_by_year()), so they only visit the movies that are printed. Option 3 asks for a last name and first name of the author to 
+        search for them in the catalog and return the movies that correspond to them (none if the author is not found in the catalog or the format is not valid, in which case 
+        the most similar directors are suggested with similar_directors()), it also checks that they are not empty. Option 4 asks 
         for a year, converting it to an integer (this makes if the user does not enter the character of a number an exception occurs, using a try-except so that when this happens a warning appears indicating that a number must 
-        be entered), if the counter is 0 it means that no movie was released in that year. These last three options use the iterator (__iter__) of the list to iterate through it. Option 5 calls the private method _file_writer() 
-        to create the corresponding file without duplicates. Finally, option 6 allows printing statistical data from the catalog by calling the pandas_stats() function, and passing data_film_list as a parameter.
+        be entered), if the list of movies found is empty it means that no movie was released in that year. Option 5 calls the private method _file_writer() 
+        to create the corresponding file without duplicates. Finally, option 6 allows printing statistical data from the catalog by calling the pandas_stats() function.
         
         Returns
         -------
@@ -462,10 +1644,7 @@ class Film_Manager:
                if option == 1:
                    try: 
                        film_catalog = input("Enter the name of the file containing the film catalog: \n")
-                       with open(film_catalog, encoding="utf-8") as f:
-                            # With strip(), we ensure that there are no additional spaces, tabs, or newline characters present in the file.
-                           films_text = f.read().strip()
-                           data_film_list = self._create_film(films_text)
+                       self._create_film(film_catalog)
                    except:
                        print("\nPlease enter the name of a valid file in your directory")
                elif option == 2:
@@ -475,14 +1654,17 @@ class Film_Manager:
                elif option == 3:
                     author_ln = input("Enter the director's last name for the movies you want to consult\n")
                     author_fn = input("Enter the director's first name for the movies you want to consult\n")
-                    cnt = 0
-                    if author_ln.isalpha() and author_fn.isalpha():
-                        for film in self.film_list:
-                            if film.director == f"{author_ln}, {author_fn}":
-                                print(film)
-                                cnt+=1
-                        if cnt == 0:
-                            print(f"\nNo movies directed by {author_ln}, {author_fn} are found in the catalog, or incorrect format: (Last Name, First Name)")
+                    if author_ln.strip() and author_fn.strip():
+                        # The director index gives directly the movies of the director (no need to traverse film_list)
+                        director = f"{author_ln.strip()}, {author_fn.strip()}"
+                        director_films = self.films_by_director(director)
+                        for film in director_films:
+                            print(film)
+                        if len(director_films) == 0:
+                            print(f"\nNo movies directed by {director} are found in the catalog, or incorrect format: (Last Name, First Name)")
+                            suggestions = self.similar_directors(director)
+                            if suggestions:
+                                print("Did you mean: " + " / ".join(suggestions) + "?")
                     else:
                         print("\nPlease enter a valid name")
  
@@ -490,13 +1672,11 @@ class Film_Manager:
                elif option == 4:
                     year = input("Enter the release year of the movies you want to consult: \n\n")             
                     try:
-                         cnt = 0
-                         for film in self.film_list:
-                             # If year is not an integer, it raises an exception (except)
-                             if film.release_year == int(year):
-                                 print(film)
-                                 cnt+=1
-                         if cnt == 0:
+                         # If year is not an integer, it raises an exception (except)
+                         year_films = self.films_by_year(int(year))
+                         for film in year_films:
+                             print(film)
+                         if len(year_films) == 0:
                              print(f"No movie in the catalog was released in the year {year}")
                     except:
                          print("Please enter a valid year")
@@ -506,133 +1686,593 @@ class Film_Manager:
                     print("A file named 'unique_films_file.txt' has been created in your directory")
  
                elif option == 6:
-                   self._pandas_stats(data_film_list)
+                   self._pandas_stats()
                option = int(input("\n***   FILM CATALOG MENU   ***\nChoose one of the following options: \n 1) Introduce a catalog \n   2) Consult all platform movies \n   3) Consult movies directed by an author \n   4) Consult movies released in a year\n 5) Create a file with the movies containing no duplicates \n 6) Show stats of the catalog \n  - Press any other key to exit\n"))
 
            print("Exiting...")
         except:
             print("Exiting...")
 
-    def _delete_duplicated(self) -> list :
+    def _delete_duplicated(self) -> None :
         """
-        This function adds the movies from film_list to the ordered list film_unique_list, ensuring there are no duplicates. To do this, it iterates through the movies in film_list. At the beginning, 
-        film_unique_list is empty, so it adds the first Film from film_list to it. In the following iterations, the function stores a marker with the positions of film_unique_list, traversing it and changing 
-        the position to the next one to match other_film (the Film from film_unique_list), aiming to ensure that the Film from the iteration (from film_list) doesn't have duplicates in film_unique_list. The 
-        duplicated value starts as False, and if any movie in film_unique_list is found to be equal to the Film, it becomes True. If this happens, it checks the release years of the movies, and if the release year 
-        is greater in the Film from film_list, it replaces the other film (other_film) in film_unique_list with Film at the marker position stored by the function. If there are no duplicates, the Film is added to 
-        film_unique_list. Finally, it traverses film_unique_list to store the movie data in the data_film_list, which will be used later for statistical data. It returns this list.
+        This function adds the movies from film_list to the ordered list film_unique_list, ensuring there are no duplicates. Instead of traversing film_unique_list for every movie of 
+        film_list, the function uses a dictionary (unique) whose keys are the Films themselves, which are hashed by (director, title) just like they are compared by __eq__. Each entry stores the 
+        position of the Film in film_unique_list (None if it has not been added yet) and the version of the Film that has to be kept. First, the dictionary is filled with the movies already stored in 
+        film_unique_list (walking it once with a marker, as the positions are needed to remove them). Then, film_list is traversed once: if the Film is not in the dictionary it is inserted, and if it is, 
+        the version with the newest release year is kept. Finally, the kept versions are written to film_unique_list: when a newer version of a stored Film has been found, the old Film is deleted 
+        from its position (all of them at once with delete_all()) (the newer version can have another place in the order, so it cannot simply take the old one's position), and the newer versions are added to the ordered list all at once 
+        with add_all(), together with the new movies, so film_unique_list is always ordered. Every lookup in the dictionary is O(1), so the whole process is a single O(n) pass over film_list. 
+        Every Film that enters or leaves film_unique_list is also passed to the running statistics (stats), so they are always up to date.
              
         Returns:
         --------
-        list 
-            A list with the movies from the catalog ordered and without duplicates, using this list the statistics will be calculated. 
+        None
                 
         Note:
         -----
-
+        Two Films are duplicated when they have the same director and title (see __eq__ and __hash__), the one with the newest release year is kept.
         """
+        self._new_version()
+        # Key: Film (director, title), value: [position in film_unique_list or None, Film to keep]
+        unique = {}
         # The marker starts as the position of the first element
-        data_film_list = []  
+        if not self.film_unique_list.is_empty():
+            marker = self.film_unique_list.first()
+            for other_film in self.film_unique_list:
+                unique[other_film] = [marker, other_film]
+                marker = self.film_unique_list.after(marker) # Next position (of next other_film)
         # Iterate through the film_list
         for film in self.film_list:
-            # If film_unique_list is empty film is added
-            if self.film_unique_list.is_empty():
-                self.film_unique_list.add(film)
-            else: 
-                marker = self.film_unique_list.first() #it represents the position on other_film
-                duplicated = False
-                for other_film in self.film_unique_list:
-                    if other_film == film:
-                        duplicated = True
-                        # The film_unique_list must contain the version of the film with the newest release year
-                        if other_film.release_year < film.release_year:
-                            self.film_unique_list.replace(marker, film)
-                    marker = self.film_unique_list.after(marker) # Next position (of next other_film)
-                    
-                if not duplicated:
-                     self.film_unique_list.add(film)
-                            
-        for film in self.film_unique_list:
-            data_film_list.append([film.director, film.title, film.release_year, film.score])
-        return data_film_list
+            entry = unique.get(film)
+            if entry is None:
+                unique[film] = [None, film]
+            # The film_unique_list must contain the version of the film with the newest release year
+            elif entry[1].release_year < film.release_year:
+                entry[1] = film
+        
+        new_films = []
+        old_positions = []
+        for marker, film in unique.values():
+            if marker is None:
+                new_films.append(film)
+            elif marker.element() is not film:
+                # The newer version goes to its own ordered place with the new movies
+                old_positions.append(marker)
+                new_films.append(film)
+        # The old versions are deleted all at once (the array list is rebuilt only one time)
+        for old_film in self.film_unique_list.delete_all(old_positions):
+            self.stats.remove(old_film)
+        # The new movies are added all at once, so the ordered list is only traversed one time
+        self.film_unique_list.add_all(new_films, key=attrgetter("sort_key"))
+        for film in new_films:
+            self.stats.add(film)
     
         
-    def _file_writer(self) -> None:
+    def top_films(self, n: int, director: str = None, year: int = None) -> list:
+        """
+        Returns the n Films of the catalog without duplicates with the highest score, from the whole catalog or only from the Films of a director and/or of a release 
+        year. The Films are not sorted: they are traversed only once keeping a heap with the best n Films found (heapq.nlargest), so the cost is O(m log n) for m 
+        candidate Films. If a director is given, the candidates are taken from the director index (removing its duplicates with _unique_films()), so only the Films 
+        of the director are visited.
+        
+        Parameters
+        ----------
+        n : int
+            Number of Films wanted.
+        director : str
+            If it is given, only the Films of this director (last name, first name) are considered.
+        year : int
+            If it is given, only the Films released this year are considered.
+
+        Returns
+        -------
+        list
+            The (at most) n Films with the highest score, from the highest to the lowest score (Films with the same score keep the order of the catalog).
+        """
+        def query():
+            if director is not None:
+                candidates = _unique_films(self._director_films(director))
+            else:
+                candidates = self.film_unique_list
+            if year is not None:
+                candidates = (film for film in candidates if film.release_year == year)
+            return nlargest(n, candidates, key=attrgetter("score"))
+        return self._cached_query(("top", n, director, year), query)
+
+    def similar_directors(self, name: str, limit: int = 5) -> list:
+        """
+        Returns the directors of the catalog whose names are most similar to the given one, for searches with typos or incomplete names. The trigram index of the 
+        directors (built while the catalog is loaded) is used, so only the directors that share some trigram with the name are visited.
+        
+        Parameters
+        ----------
+        name : str
+            The name searched (last name, first name), possibly with typos.
+        limit : int
+            Maximum number of directors returned.
+
+        Returns
+        -------
+        list
+            The directors, from the most to the least similar one (empty if none is similar enough).
+        """
+        return [director for director, similarity in self.director_search.search(name, limit)]
+
+    def similar_titles(self, title: str, limit: int = 5) -> list:
+        """
+        Returns the titles of the catalog most similar to the given one, for searches with typos or incomplete titles, using the trigram index of the titles.
+        
+        Parameters
+        ----------
+        title : str
+            The title searched, possibly with typos.
+        limit : int
+            Maximum number of titles returned.
+
+        Returns
+        -------
+        list
+            The titles, from the most to the least similar one (empty if none is similar enough).
+        """
+        return [other_title for other_title, similarity in self.title_search.search(title, limit)]
+
+    def apply_delta(self, delta_file: str) -> tuple:
+        """
+        Applies a file with the changes of a catalog (a delta) to the loaded catalog, without loading it again. Each line of the delta is a movie in the same format 
+        as the catalogs, preceded by its operation:
+            + director; title; release year; score      (a new movie)
+            - director; title; release year; score      (a retracted movie)
+        The retracted Films are removed from film_list and from the indexes (a retracted movie must match a Film of the catalog in all its attributes, otherwise it is 
+        ignored), and the new ones are inserted in them. Then, film_unique_list is only updated for the (director, title) keys that appear in the delta: the version 
+        kept for each of them is calculated before and after the changes (using the director index) and, if it has changed, the old version is removed and the new 
+        one is added, updating the running statistics. The whole delta is checked before the catalog is changed (the file is parsed, the retracted Films are found 
+        with the director index and the positions of the kept versions in film_unique_list), so if it fails, the catalog is left as it was.
+        
+        Every list is changed in batches: the positions are found with find_all(), removed with delete_all() and the new Films are inserted with add_all(), so no 
+        list is walked once per movie of the delta. With SkipOrderedPositionalList every change costs O(log n) and a small delta does not depend on the size of the 
+        catalog; with the linked and the array lists each batch costs a single O(n) pass, still much less than loading the catalog again.
+        
+        Parameters
+        ----------
+        delta_file : str
+            Name of the delta file.
+
+        Returns
+        -------
+        tuple
+            The number of Films added and the number of Films removed from film_list.
+        
+        Raises
+        ------
+        ValueError
+            If a line of the delta does not start with + or -, or the movie is not valid, or the manager is in columnar mode, or film_unique_list does not 
+            contain the version of a movie that it should keep.
+        """
+        if self.columnar:
+            raise ValueError("Deltas cannot be applied to a columnar catalog")
+        added = []
+        retracted = []
+        with open(delta_file, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                operation, film = line[0], Film.from_line(line[1:].strip())
+                if operation == "+":
+                    added.append(film)
+                elif operation == "-":
+                    retracted.append(film)
+                else:
+                    raise ValueError(f"Invalid delta line: {line}")
+
+        # Version of every affected movie in film_unique_list before the changes, and its position
+        kept = {(film.director, film.title): None for film in added + retracted}
+        for director, title in kept:
+            kept[director, title] = self._newest_version(director, title)
+        old_films = [old_film for old_film in kept.values() if old_film is not None]
+        old_positions = self.film_unique_list.find_all(old_films)
+        if None in old_positions:
+            raise ValueError(f"The catalog without duplicates does not contain: {old_films[old_positions.index(None)]}")
+        positions = {(old_film.director, old_film.title): position for old_film, position in zip(old_films, old_positions)}
+        # Stored Films that are retracted (each one can only match one line of the delta)
+        stored_films = []
+        found = set()
+        for film in retracted:
+            stored_film = self._find_film(film, found)
+            if stored_film is not None:
+                stored_films.append(stored_film)
+                found.add(id(stored_film))
+
+        # Nothing has been changed until here (_remove_films() checks the positions in film_list before removing)
+        self._remove_films(stored_films)
+        self._add_films(added)
+
+        self._new_version()
+        deleted_positions = []
+        new_films = []
+        for (director, title), old_film in kept.items():
+            new_film = self._newest_version(director, title)
+            if new_film is old_film:
+                continue
+            if old_film is not None:
+                deleted_positions.append(positions[director, title])
+            if new_film is not None:
+                new_films.append(new_film)
+        for old_film in self.film_unique_list.delete_all(deleted_positions):
+            self.stats.remove(old_film)
+        self.film_unique_list.add_all(new_films, key=attrgetter("sort_key"))
+        for new_film in new_films:
+            self.stats.add(new_film)
+        return len(added), len(stored_films)
+
+    def run_batch(self, queries_file: str, output: str) -> tuple:
+        """
+        Runs all the queries of a file on the loaded catalog, without the interactive menu, and writes the results to an output file. Each line of the queries file 
+        is a query, with its type and its arguments separated by a semicolon and a space (the same separator as the catalogs):
+            - director; Last Name, First Name
+            - year; 1994
+            - prefix; Beginning of the director's name
+            - range; First director; Last director
+            - years; Last Name, First Name; 1990; 2000
+            - top; 10                  (optionally followed by ; director or ; year=1994)
+        For every query, a line "# query -> number of films (latency)" and the Films found are written to the output file. The latency of each query is measured 
+        with time.perf_counter() and only includes the query itself (not the writing), and at the end of the file the total number of queries, the total time and 
+        the throughput (queries per second) are written. Nothing is printed per query, so that the measures are not affected by the output.
+        
+        Parameters
+        ----------
+        queries_file : str
+            Name of the file with the queries (one per line, empty lines are ignored).
+        output : str
+            Name of the file where the results are written.
+
+        Returns
+        -------
+        tuple
+            The number of queries run and the total time (in seconds) spent running them.
+            
+        Raises
+        ------
+        ValueError
+            If a query has an unknown type or invalid arguments.
+        """
+        cnt = 0
+        total_time = 0.0
+        with open(queries_file, encoding="utf-8") as queries, open(output, "w", encoding="utf-8", buffering=1 << 20) as f:
+            for query in queries:
+                query = query.strip()
+                if not query:
+                    continue
+                start = time.perf_counter()
+                films = self._run_query(query)
+                latency = time.perf_counter() - start
+                cnt += 1
+                total_time += latency
+                f.write(f"# {query} -> {len(films)} films ({latency * 1e6:.1f} us)\n")
+                f.write("".join(f"{film}\n" for film in films))
+            throughput = cnt / total_time if total_time > 0 else float("inf")
+            f.write(f"# {cnt} queries in {total_time:.6f} s ({throughput:.1f} queries/s)\n")
+        return cnt, total_time
+
+    def _run_query(self, query: str) -> list:
+        """
+        Runs a single query of a batch (see run_batch() for the format) calling the corresponding public method of the manager.
+        
+        Parameters
+        ----------
+        query : str
+            The query, with its type and arguments separated by "; ".
+
+        Returns
+        -------
+        list
+            The Films found.
+            
+        Raises
+        ------
+        ValueError
+            If the query has an unknown type or invalid arguments.
+        """
+        kind, *args = query.split("; ")
+        if kind == "director" and len(args) == 1:
+            return self.films_by_director(args[0])
+        elif kind == "year" and len(args) == 1:
+            return self.films_by_year(int(args[0]))
+        elif kind == "prefix" and len(args) == 1:
+            return self.films_by_director_prefix(args[0])
+        elif kind == "range" and len(args) == 2:
+            return self.films_by_director_range(args[0], args[1])
+        elif kind == "years" and len(args) == 3:
+            return self.films_by_director_years(args[0], int(args[1]), int(args[2]))
+        elif kind == "top" and len(args) in (1, 2):
+            if len(args) == 2 and args[1].startswith("year="):
+                return self.top_films(int(args[0]), year=int(args[1][len("year="):]))
+            return self.top_films(int(args[0]), *args[1:])
+        raise ValueError(f"Invalid query: {query}")
+
+    def merge_catalogs(self, film_catalogs: list, output: str = "unique_films_file.txt", presorted: bool = False, compress: bool = False) -> int:
+        """
+        Merges several catalog files (for example, the catalogs of different providers) into a single file with the movies ordered and without duplicates, in the same 
+        format as the file of option 5 ("unique_films_file.txt" by default). The catalogs are not loaded in the manager: each of them is read as a sorted run 
+        (_sorted_run()), the runs are merged with a heap (heapq.merge), which only keeps the next Film of each run, and the merged stream goes through 
+        _unique_films(), which removes the duplicates one director at a time, before being written. So, at most one run per catalog is kept in memory (none if the 
+        catalogs are already sorted).
         
+        Parameters
+        ----------
+        film_catalogs : list
+            Names of the catalog files to merge.
+        output : str
+            Name of the file that is created with the merged catalog.
+        presorted : bool
+            True if the catalogs are already sorted (by director, release year and title), so they are read line by line without sorting them.
+        compress : bool
+            True to compress the output file with gzip.
+
+        Returns
+        -------
+        int
+            Number of movies written in the output file.
+            
+        Raises
+        ------
+        ValueError
+            If presorted is True and one of the catalogs is not sorted.
         """
-        Writes to a new file ("unique_films_file.txt") the ordered movies, without duplicates. 
+        runs = [self._sorted_run(film_catalog, presorted) for film_catalog in film_catalogs]
+        return _write_films(_unique_films(merge(*runs, key=attrgetter("sort_key"))), output, compress)
+
+    def _sorted_run(self, film_catalog: str, presorted: bool):
+        """
+        Generator that yields the Films of a catalog file ordered by their sort_key. If the catalog is already sorted, the file is read line by line (with _read_films()) 
+        checking the order; otherwise, the whole catalog is read and sorted once.
+        
+        Parameters
+        ----------
+        film_catalog : str
+            Name of the catalog file.
+        presorted : bool
+            True if the catalog is already sorted.
+            
+        Yields
+        ------
+        Film
+            The Films of the catalog in order.
+        
+        Raises
+        ------
+        ValueError
+            If presorted is True and the catalog is not sorted.
+        """
+        if not presorted:
+            yield from sorted(self._read_films(film_catalog), key=attrgetter("sort_key"))
+            return
+        previous = None
+        for film in self._read_films(film_catalog):
+            if previous is not None and film < previous:
+                raise ValueError(f"The catalog {film_catalog} is not sorted: {film}")
+            yield film
+            previous = film
+
+    def _file_writer(self, output: str = "unique_films_file.txt", compress: bool = False) -> int:
+        
+        """
+        Writes to a new file ("unique_films_file.txt" by default) the ordered movies, without duplicates. 
                     
         Method Characteristics:
-            - Starting from the already ordered and duplicate-free film_unique_list:
-            - A txt file is created with a fixed name 'unique_films_file.txt', and there all the movies remaining in the film_unique_list are stored. 
-            - This file is written with the same syntax as the original movie catalog (film_text).
+            - The movies are not taken from film_unique_list: film_list is already ordered, so it is traversed only once and its duplicates are removed on the fly 
+              by _unique_films() (which gives the same movies as film_unique_list), and the movies are written as they come out.
+            - The lines are written in large blocks (_write_films()), not with one write call per movie. 
+            - This file is written with the same syntax as the original movie catalog (film_text), and it can be compressed with gzip.
+        
+        Parameters
+        ----------
+        output : str
+            Name of the file to be created.
+        compress : bool
+            True to compress the file with gzip (its name should end with ".gz").
                 
         Returns:
         --------
-        None
+        int
+            Number of movies written in the file.
                     
         Note:
         -----
         This method is called internally by the user_menu() function and executes option 5 of the menu.
         """
-        
-        nombre_archivo = "unique_films_file.txt"
-    
-        with open(nombre_archivo, "w") as archivo: 
-            for film in self.film_unique_list:
-                archivo.write(str(film))
-                archivo.write('\n')
+        return _write_films(_unique_films(self.film_list), output, compress)
 
-    def _pandas_stats(self, data_film_list:list) -> None:
+    def _pandas_stats(self) -> None:
         """
-        Calculates and prints statistics based on the movie data in the catalog: 
+        Prints statistics based on the movie data in the catalog (without duplicates): 
                 
                 - Number of movies per director.
                 - Average score per director.
                 - Average score per release year. 
             
-            Parameters
-            ----------
-            data_film_list : list
-                List with the ordered and duplicate-free Film objects from the catalog.
+            These values are not calculated here: they are kept up to date by the CatalogStats of the manager (stats) every time a Film enters film_unique_list, 
+            so this method only builds small DataFrames (one row per director or per year) to print them. With FilmFrames, stats is the frame without duplicates,
+            which calculates the same DataFrames with a groupby of its columns.
     
             Returns
             -------
             None
                 The metrics are printed on the screen.
         """
-        data = pandas.DataFrame(data_film_list, columns=["Director", "Films", "Release year", "Score"])
+        director_stats = self.stats.director_frame()
         
         #Number of movies per director (counter).
-        group_col = "Director"
-        target_col = "Films"
-        single_stats = data.groupby(group_col).agg({target_col: ["count"]})
         print('\n', "*"*37, '\n', "          Number of films     ", '\n',  "*"*37)
-        print(single_stats, "\n")
+        print(director_stats[[("Films", "count")]], "\n")
         #Average score per director.
-        group_col = "Director"
-        target_col = "Score"
-        single_stats = data.groupby(group_col).agg({target_col: ["mean"]})
         print('\n', "*"*37, '\n', "      Mean score for director   ", '\n',  "*"*37)
-        print(single_stats, "\n")
+        print(director_stats[[("Score", "mean")]], "\n")
         #Average score per release year.
-        group_col = "Release year"
-        target_col = "Score"
-        single_stats = data.groupby(group_col).agg({target_col: ["mean"]})
         print('\n', "*"*37, '\n', "    Mean score for release year ", '\n',  "*"*37)
-        print(single_stats, "\n")
+        print(self.stats.year_frame(), "\n")
+
+def _unique_films(films):
+    """
+    Generator that removes the duplicates of a stream of Films ordered by their sort_key (director, release year, title), keeping the version of each Film with 
+    the newest release year (the first one if there are several with that year), as Film_Manager._delete_duplicated() does. As duplicated Films have the same 
+    director, and the Films of a director are consecutive in the stream, only the Films of the current director are kept in memory: when the director changes, 
+    the Films of the previous one are yielded ordered.
+    
+    Parameters
+    ----------
+    films : iterable
+        The Films, ordered by their sort_key.
+
+    Yields
+    ------
+    Film
+        The Films without duplicates, ordered by their sort_key.
+    """
+    director = None
+    kept = {}           # title -> newest Film of the current director
+    for film in films:
+        if film.director != director:
+            yield from sorted(kept.values(), key=attrgetter("sort_key"))
+            director = film.director
+            kept = {}
+        other_film = kept.get(film.title)
+        if other_film is None or other_film.release_year < film.release_year:
+            kept[film.title] = film
+    yield from sorted(kept.values(), key=attrgetter("sort_key"))
+
+def _write_films(films, output: str, compress: bool = False, block_size: int = 4096) -> int:
+    """
+    Writes a stream of Films to a file, one per line and in the catalog format (director; title; release year; score). The lines of block_size Films are joined 
+    and written with a single call, and the file uses a large buffer (1 MiB), so the cost is one sequential pass over the Films. The Films are written to a 
+    temporary file in the same directory, which replaces the output file only when the whole stream has been written: if the stream fails (for example, a 
+    catalog that should be sorted is not), the temporary file is removed and no truncated output is left.
+    
+    Parameters
+    ----------
+    films : iterable
+        The Films to be written, in order.
+    output : str
+        Name of the file to be created.
+    compress : bool
+        True to compress the file with gzip.
+    block_size : int
+        Number of Films written with each call.
+
+    Returns
+    -------
+    int
+        Number of Films written.
+    """
+    temporary = f"{output}.{os.getpid()}.tmp"
+    if compress:
+        f = gzip.open(temporary, "wt", encoding="utf-8")
+    else:
+        f = open(temporary, "w", encoding="utf-8", buffering=1 << 20)
+    cnt = 0
+    try:
+        with f:
+            block = []
+            for film in films:
+                block.append(f"{film}\n")
+                if len(block) == block_size:
+                    f.write("".join(block))
+                    cnt += len(block)
+                    block = []
+            f.write("".join(block))
+            cnt += len(block)
+        os.replace(temporary, output)
+    except BaseException:
+        os.remove(temporary)
+        raise
+    return cnt
+
+def _split_catalog(film_catalog: str, parts: int) -> list:
+    """
+    Splits the catalog file in (at most) the given number of byte ranges of similar size, moving each cut to the beginning of the next line so that no movie is
+    divided between two ranges.
+    
+    Parameters
+    ----------
+    film_catalog : str
+        Name of the catalog file.
+    parts : int
+        Number of ranges wanted.
+
+    Returns
+    -------
+    list
+        List of tuples (start, end) with the byte ranges, which cover the whole file.
+    """
+    size = os.path.getsize(film_catalog)
+    cuts = [0]
+    with open(film_catalog, "rb") as f:
+        for i in range(1, parts):
+            f.seek(size * i // parts)
+            # The cut is moved to the start of the next line
+            f.readline()
+            cut = min(f.tell(), size)
+            if cut > cuts[-1]:
+                cuts.append(cut)
+    if cuts[-1] < size:
+        cuts.append(size)
+    return list(zip(cuts, cuts[1:]))
+
+def _parse_catalog_range(film_catalog: str, start: int, end: int) -> list:
+    """
+    Parses the movies of a byte range of the catalog file (as returned by _split_catalog) and returns them sorted. It is executed by each process of the pool used by
+    Film_Manager._read_films_parallel(), so it is defined at module level to be sent to the processes. The movies are returned as tuples (director, title, release 
+    year, score), the arguments of Film, which are much cheaper to send back to the main process than Film objects.
+    
+    Parameters
+    ----------
+    film_catalog : str
+        Name of the catalog file.
+    start : int
+        First byte of the range (the beginning of a line).
+    end : int
+        Byte after the end of the range (the beginning of a line or the end of the file).
+
+    Returns
+    -------
+    list
+        The tuples of the movies of the range ordered by director, release year and title (ROW_KEY, the same order as the sort_key of the Films).
+
+    Raises
+    ------
+    ValueError
+        If a line does not have four attributes or the release year or the score are not numbers.
+    """
+    with open(film_catalog, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+    rows = []
+    # Only "\n" ends a line, as when the file is iterated in _read_films() (splitlines() would also split at other separators, like U+2028)
+    for line in text.split("\n"):
+        line = line.strip()
+        if line:
+            director, title, release_year, score = line.split('; ')
+            rows.append((director, title, int(release_year), float(score)))
+    rows.sort(key=ROW_KEY)
+    return rows
 
 def main():
     """
-    The main function that reads from a file and starts the simulation.
+    The main function that starts the interactive menu or, if it is called with three arguments (catalog, queries file and output file), loads the catalog and runs 
+    the queries in batch mode:
+        python main_listas.py catalog.txt queries.txt results.txt
     """
     manager = Film_Manager()
-    manager.user_menu()
- 
- 
-if __name__ == '__main__':
-    main()
-
+    if len(sys.argv) == 4:
+        film_catalog, queries_file, output = sys.argv[1:]
+        start = time.perf_counter()
+        manager._create_film(film_catalog)
+        print(f"Catalog loaded: {len(manager.film_list)} films in {time.perf_counter() - start:.3f} s")
+        cnt, total_time = manager.run_batch(queries_file, output)
+        throughput = cnt / total_time if total_time > 0 else float("inf")
+        print(f"{cnt} queries in {total_time:.6f} s ({throughput:.1f} queries/s), results in {output}")
+    else:
+        manager.user_menu()
  
  
 if __name__ == '__main__':
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Santrich Escalona, Elizabet
+(elizabet.santrich.escalona@udc.es)
+Rodríguez Polín, Isabel
+(isabel.rodriguezp@udc.es)
+"""
+
+from random import random
+
+class SkipOrderedPositionalList:
+  """An ordered sequential container of elements stored in a skip list.
+
+  It offers the same interface as LinkedOrderedPositionalList and
+  ArrayOrderedPositionalList.  Every node is linked at level 0 (so the
+  in-order iteration just follows those links) and, with probability 1/2
+  for each extra level, in the upper levels that are used as express
+  lanes to find the place of a new element in expected O(log n) steps.
+  Elements equal to ones already stored are placed after them.
+  """
+
+  MAX_LEVEL = 32                               # enough for 2**32 elements
+
+  #-------------------------- nested _Node class --------------------------
+  class _Node:
+    """Lightweight, nonpublic class for storing a skip list node."""
+    __slots__ = '_element', '_prev', '_next'   # streamline memory usage
+
+    def __init__(self, element, height):
+      self._element = element
+      self._prev = None                        # previous node at level 0
+      self._next = [None] * height             # next node at each level
+
+  #-------------------------- nested Position class --------------------------
+  class Position:
+    """An abstraction representing the location of a single element.
+
+    Note that two position instaces may represent the same inherent
+    location in the list.  Therefore, users should always rely on
+    syntax 'p == q' rather than 'p is q' when testing equivalence of
+    positions.
+    """
+
+    def __init__(self, container, node):
+      """Constructor should not be invoked by user."""
+      self._container = container
+      self._node = node
+
+    def element(self):
+      """Return the element stored at this Position."""
+      return self._node._element
+
+    def __eq__(self, other):
+      """Return True if other is a Position representing the same location."""
+      return type(other) is type(self) and other._node is self._node
+
+    def __ne__(self, other):
+      """Return True if other does not represent the same location."""
+      return not (self == other)               # opposite of __eq__
+
+  #------------------------------- utility methods -------------------------------
+  def __init__(self):
+    """Create an empty list."""
+    self._header = self._Node(None, self.MAX_LEVEL)     # sentinel before first
+    self._last = None                          # last node (or None if empty)
+    self._level = 1                            # number of levels in use
+    self._size = 0                             # number of elements
+
+  def _random_height(self):
+    """Return the number of levels of a new node (geometric distribution)."""
+    height = 1
+    while height < self.MAX_LEVEL and random() < 0.5:
+      height += 1
+    return height
+
+  def _validate(self, p):
+    """Return position's node, or raise appropriate error if invalid."""
+    if not isinstance(p, self.Position):
+      raise TypeError('p must be proper Position type')
+    if p._container is not self:
+      raise ValueError('p does not belong to this container')
+    if p._node._next is None:                  # convention for deleted nodes
+      raise ValueError('p is no longer valid')
+    return p._node
+
+  def _make_position(self, node):
+    """Return Position instance for given node (or None if sentinel)."""
+    if node is None or node is self._header:
+      return None                              # boundary violation
+    else:
+      return self.Position(self, node)         # legitimate position
+
+  def _link_after(self, node, update):
+    """Link node after update[i] at each of its levels."""
+    for i in range(len(node._next)):
+      node._next[i] = update[i]._next[i]
+      update[i]._next[i] = node
+    successor = node._next[0]
+    node._prev = update[0]
+    if successor is None:
+      self._last = node
+    else:
+      successor._prev = node
+    self._size += 1
+
+  #------------------------------- accessors -------------------------------
+  def __len__(self):
+    """Return the number of elements in the list."""
+    return self._size
+
+  def is_empty(self):
+    """Return True if the list is empty."""
+    return self._size == 0
+
+  def first(self):
+    """Return the first Position in the list (or None if list is empty)."""
+    return self._make_position(self._header._next[0])
+
+  def last(self):
+    """Return the last Position in the list (or None if list is empty)."""
+    return self._make_position(self._last)
+
+  def before(self, p):
+    """Return the Position just before Position p (or None if p is first)."""
+    node = self._validate(p)
+    return self._make_position(node._prev)
+
+  def after(self, p):
+    """Return the Position just after Position p (or None if p is last)."""
+    node = self._validate(p)
+    return self._make_position(node._next[0])
+
+  def find(self, e):
+    """Return the Position of element e (the same object), or None.
+
+    The first element equal to e is found in expected O(log n).
+    """
+    walk = self._header
+    for i in range(self._level - 1, -1, -1):
+      while walk._next[i] is not None and walk._next[i]._element < e:
+        walk = walk._next[i]
+    walk = walk._next[0]
+    while walk is not None and not (e < walk._element):
+      if walk._element is e:
+        return self.Position(self, walk)
+      walk = walk._next[0]                     # other elements equal to e
+    return None
+
+  def find_all(self, elements):
+    """Return the Positions of the given elements (the same objects).
+
+    Each element is found with its own expected O(log n) search, as find() does.
+    The Positions are returned in the order of the elements (None for the
+    ones that are not in the list).
+    """
+    return [self.find(e) for e in elements]
+
+  def __iter__(self):
+    """Generate a forward iteration of the elements of the list."""
+    walk = self._header._next[0]
+    while walk is not None:
+      yield walk._element
+      walk = walk._next[0]
+
+  #------------------------------- mutators -------------------------------
+  def add(self, e):
+    """Insert element e in its ordered place and return its new Position.
+
+    The place is found going down the express lanes, in expected O(log n).
+    """
+    update = [self._header] * self.MAX_LEVEL   # last node before e per level
+    walk = self._header
+    for i in range(self._level - 1, -1, -1):
+      while walk._next[i] is not None and walk._next[i]._element <= e:
+        walk = walk._next[i]
+      update[i] = walk
+    node = self._Node(e, self._random_height())
+    self._level = max(self._level, len(node._next))
+    self._link_after(node, update)
+    return self.Position(self, node)
+
+  def add_all(self, elements, key=None, presorted=False):
+    """Insert every element of the (unsorted) iterable in its ordered place.
+
+    The batch is sorted once and merged with the current nodes, and then
+    all the levels are relinked in a single pass, so loading n elements
+    costs O(n log n).  The nodes already stored are reused, so their
+    Positions remain valid.  The optional key is used to sort the batch
+    and must agree with the elements' ordering.  If presorted is True the
+    batch is trusted to be already sorted and it is not sorted again.  A
+    batch much smaller than the list (k elements with k times the levels
+    below n) is inserted node by node with add(), in expected O(k log n).
+    """
+    batch = list(elements) if presorted else sorted(elements, key=key)
+    if not batch:
+      return
+    if len(batch) * self._level < self._size:
+      # A small batch is cheaper to insert node by node than relinking all
+      for e in batch:
+        self.add(e)                            # after the equal elements
+      return
+    if key is None:
+      key = lambda e: e
+    nodes = []
+    walk = self._header._next[0]
+    for e in batch:
+      while walk is not None and not (key(e) < key(walk._element)):
+        nodes.append(walk)                     # stored nodes go first on ties
+        walk = walk._next[0]
+      nodes.append(self._Node(e, self._random_height()))
+    while walk is not None:
+      nodes.append(walk)
+      walk = walk._next[0]
+    # Relink every level from scratch following the merged order
+    tails = [self._header] * self.MAX_LEVEL
+    previous = self._header
+    self._level = 1
+    for node in nodes:
+      height = len(node._next)
+      for i in range(height):
+        tails[i]._next[i] = node
+        tails[i] = node
+      node._prev = previous
+      previous = node
+      self._level = max(self._level, height)
+    for i in range(self.MAX_LEVEL):
+      tails[i]._next[i] = None
+    self._last = previous
+    self._size = len(nodes)
+
+  def delete(self, p):
+    """Remove and return the element at Position p."""
+    node = self._validate(p)
+    e = node._element
+    walk = self._header
+    for i in range(self._level - 1, -1, -1):
+      while walk._next[i] is not None and walk._next[i]._element < e:
+        walk = walk._next[i]
+      if i < len(node._next):
+        # Among the elements equal to e, look for the node itself
+        pred = walk
+        while pred._next[i] is not node:
+          pred = pred._next[i]
+        pred._next[i] = node._next[i]
+    successor = node._next[0]
+    if successor is None:
+      self._last = node._prev if node._prev is not self._header else None
+    else:
+      successor._prev = node._prev
+    while self._level > 1 and self._header._next[self._level - 1] is None:
+      self._level -= 1
+    self._size -= 1
+    node._prev = node._next = node._element = None      # deprecate node
+    return e
+
+  def delete_all(self, positions):
+    """Remove the elements at all the given Positions and return them.
+
+    Each node is unlinked in expected O(log n).  All the Positions are validated (and must be
+    distinct) before any is deleted.
+    """
+    positions = list(positions)
+    nodes = set()
+    for p in positions:
+      node = self._validate(p)
+      if node in nodes:
+        raise ValueError('p is repeated')
+      nodes.add(node)
+    return [self.delete(p) for p in positions]
+
+  def replace(self, p, e):
+    """Replace the element at Position p with e.
+
+    Return the element formerly at Position p.  The caller is responsible
+    for keeping the list ordered.
+    """
+    node = self._validate(p)
+    old_value = node._element                  # temporarily store old element
+    node._element = e                          # replace with new element
+    return old_value                           # return the old element value
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Santrich Escalona, Elizabet
+(elizabet.santrich.escalona@udc.es)
+Rodríguez Polín, Isabel
+(isabel.rodriguezp@udc.es)
+
+Inverted index of trigrams for approximate (typo tolerant) searches of strings, like the directors and the titles of a catalog.
+
+Each string is split in the groups of three consecutive characters (trigrams) of its lowercase text, padded with two spaces at the beginning and one at the
+end (so "Nolan" gives "  n", " no", "nol", "ola", "lan", "an "). The index stores, for each trigram, the list of the strings that contain it. The similarity of
+two strings is the number of trigrams they share divided by the number of distinct trigrams of both (Jaccard), a value between 0 and 1 that is still high
+when a few characters are wrong or missing. A search only visits the lists of the trigrams of the query, not all the strings of the index.
+
+The lists of the index are typed arrays of unsigned integers (4 bytes per entry instead of a pointer to a Python int), so the index of hundreds of thousands
+of titles takes a fraction of the memory of lists, and a search counts them with numpy (reading the arrays directly) instead of one Python step per entry.
+"""
+
+from array import array
+from heapq import nsmallest
+from math import ceil
+import numpy
+
+def trigrams(text: str) -> set:
+    """
+    Returns the set of trigrams of a string.
+
+    Parameters
+    ----------
+    text : str
+        The string.
+
+    Returns
+    -------
+    set
+        Its trigrams (of the lowercase text, padded with two spaces at the beginning and one at the end).
+    """
+    padded = "  " + text.lower() + " "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class TrigramIndex:
+    """
+    Inverted index of trigrams over a multiset of strings, which answers approximate match queries ranked by similarity.
+
+    Every string can be added several times (for example, a title shared by several films): it is indexed the first time and only counted the next ones, and it
+    leaves the results of the searches when it has been removed as many times as it was added.
+
+    Usage Example:
+        index = TrigramIndex()
+        index.add("Nolan, Christopher")
+        index.search("Nolam, Cristopher")      # [("Nolan, Christopher", 0.6...)]
+
+    Methods
+    -------
+    Public Methods:
+        add(self, key: str) -> None:
+            Adds a string to the index.
+
+        remove(self, key: str) -> None:
+            Removes one occurrence of a string from the index.
+
+        search(self, query: str, limit: int, threshold: float) -> list:
+            Returns the strings most similar to the query, with their similarity.
+    """
+
+    def __init__(self):
+        """
+        Creates an empty index.
+
+        Attributes
+        ----------
+            keys: list
+                The indexed strings (a string is identified by its position in this list).
+            numbers: dict
+                Dictionary whose keys are the indexed strings and whose values are their positions in keys.
+            counts: array
+                Number of times each string has been added (0 once it has been removed, the postings are not purged).
+            sizes: array
+                Number of distinct trigrams of each string.
+            postings: dict
+                Dictionary whose keys are the trigrams and whose values are arrays with the numbers of the strings that contain them.
+
+        Returns
+        -------
+        None.
+        """
+        self._keys = []
+        self._numbers = {}
+        self._counts = array("I")
+        self._sizes = array("I")
+        self._postings = {}
+
+    def __len__(self):
+        """
+        Returns the number of distinct strings in the index.
+        """
+        return sum(1 for count in self._counts if count > 0)
+
+    def __contains__(self, key: str):
+        """
+        Returns True if the string is in the index.
+        """
+        number = self._numbers.get(key)
+        return number is not None and self._counts[number] > 0
+
+    def add(self, key: str) -> None:
+        """
+        Adds a string to the index. Its trigrams are only indexed the first time, the next ones only increase its counter.
+
+        Parameters
+        ----------
+        key : str
+            The string.
+
+        Returns
+        -------
+        None
+        """
+        number = self._numbers.get(key)
+        if number is not None:
+            self._counts[number] += 1
+            return
+        number = self._numbers[key] = len(self._keys)
+        self._keys.append(key)
+        self._counts.append(1)
+        grams = trigrams(key)
+        self._sizes.append(len(grams))
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array("I")
+            posting.append(number)
+
+    def remove(self, key: str) -> None:
+        """
+        Removes one occurrence of a string from the index. When there are no occurrences left, the string is no longer returned by the searches (and if it is
+        added again, its old trigrams are reused).
+
+        Parameters
+        ----------
+        key : str
+            The string.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        KeyError
+            If the string is not in the index.
+        """
+        number = self._numbers.get(key)
+        if number is None or self._counts[number] == 0:
+            raise KeyError(key)
+        self._counts[number] -= 1
+
+    def search(self, query: str, limit: int = 10, threshold: float = 0.3) -> list:
+        """
+        Returns the strings of the index most similar to the query. The lists of the trigrams of the query are joined and the shared trigrams of every string are 
+        counted at once with numpy.bincount, so the strings without any trigram in common are never considered. Then the candidates are pruned with vectorized
+        filters before any of them is turned into a result: a string with a similarity of at least threshold must share at least threshold * q of the q trigrams
+        of the query (minimum overlap) and must have between threshold * q and q / threshold trigrams (length bound). The results are the same as comparing the
+        query with every string.
+        
+        Parameters
+        ----------
+        query : str
+            The string searched (it can have typos).
+        limit : int
+            Maximum number of strings returned.
+        threshold : float
+            Minimum similarity (between 0 and 1) of the strings returned.
+
+        Returns
+        -------
+        list
+            Tuples (string, similarity), from the most to the least similar one (strings with the same similarity in alphabetical order).
+        """
+        grams = trigrams(query)
+        size = len(grams)
+        # Minimum number of shared trigrams of a result (at least one, as in the lists of the index)
+        overlap = max(1, ceil(threshold * size - 1e-9))
+        if overlap > size:
+            return []
+        postings = [numpy.frombuffer(self._postings[gram], dtype=numpy.uintc) for gram in grams if gram in self._postings]
+        if not postings:
+            return []
+        shared = numpy.bincount(numpy.concatenate(postings), minlength=len(self._keys))
+        del postings                        # release the buffers of the arrays of the index
+        sizes = numpy.array(self._sizes, dtype=numpy.uintc)
+        counts = numpy.array(self._counts, dtype=numpy.uintc)
+        # Minimum overlap and length bound (with a margin for the rounding of the products)
+        candidates = numpy.flatnonzero((shared >= overlap) & (counts > 0) & (sizes * threshold <= size + 1e-9) & (size * threshold <= sizes + 1e-9))
+        common = shared[candidates]
+        similarity = common / (size + sizes[candidates] - common)
+        keep = similarity >= threshold
+        candidates, similarity = candidates[keep], similarity[keep]
+        if len(similarity) > limit > 0:
+            # Only the strings at least as similar as the limit-th one can be returned (all of them, because of the ties)
+            kth = numpy.partition(similarity, len(similarity) - limit)[len(similarity) - limit]
+            keep = similarity >= kth
+            candidates, similarity = candidates[keep], similarity[keep]
+        results = [(self._keys[number], value) for number, value in zip(candidates.tolist(), similarity.tolist())]
+        return nsmallest(limit, results, key=lambda result: (-result[1], result[0]))